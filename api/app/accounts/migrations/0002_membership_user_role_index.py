@@ -0,0 +1,17 @@
+# Generated by Django 6.1.2 on 2026-10-15 21:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['user', 'role'], name='accounts_me_user_id_be7be9_idx'),
+        ),
+    ]
@@ -47,6 +47,9 @@ class Membership(models.Model):
 
     class Meta:
         unique_together = ('user', 'organization')
+        indexes = [
+            models.Index(fields=["user", "role"]),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.role.name}@{self.organization.name}"
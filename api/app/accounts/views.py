@@ -11,12 +11,18 @@ class OrganizationViewSet(ModelViewSet):
 
 
 class RoleViewSet(ModelViewSet):
-    queryset = Role.objects.all()
+    queryset = Role.objects.prefetch_related("permissions")
     serializer_class = RoleSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return self.queryset.filter(organization_id=self.request.user.organization_id)
+
 
 class MembershipViewSet(ModelViewSet):
     queryset = Membership.objects.all()
     serializer_class = MembershipSerializer
     permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return self.queryset.filter(organization_id=self.request.user.organization_id)
@@ -1,16 +1,22 @@
-import json
 from pathlib import Path
 
+import ijson
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from django.utils.dateparse import parse_datetime
 
 from app.accounts.models import Organization
-from app.bi.models import IoTMeasurement
+from app.bi.models import IngestionJob
+from app.bi.services.air_quality import iter_items, load_items
+from app.bi.services.bulk import bulk_load_transaction
+from app.bi.tasks import ingest_air_quality_file
 
 
 class Command(BaseCommand):
-    help = "Ingest sample air-quality JSON into IoTMeasurement"
+    help = (
+        "Ingest sample air-quality JSON into IoTMeasurement. The load runs in a single "
+        "transaction; if the database crashes mid-load, re-run the command. With --async "
+        "the load is split into chunks and run by Celery workers instead."
+    )
 
     def add_arguments(self, parser):
         default_path = Path(settings.BASE_DIR).parent / "samples" / "air-quality" / "sample.json"
@@ -37,8 +43,29 @@ class Command(BaseCommand):
             "--batch-size",
             dest="batch_size",
             type=int,
-            default=1000,
-            help="Batch size for bulk insert",
+            default=settings.DASHY_BULK_BATCH_SIZE,
+            help=(
+                "Number of rows buffered and inserted per batch "
+                "(default: DASHY_BULK_BATCH_SIZE setting). Larger batches mean fewer "
+                "round trips but more memory held per batch"
+            ),
+        )
+        parser.add_argument(
+            "--async",
+            dest="run_async",
+            action="store_true",
+            help=(
+                "Queue the load on Celery instead of running it here. The file is split "
+                "into --chunk-size item chunks loaded by parallel workers, so it must be "
+                "readable at the same path on the worker hosts"
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=settings.DASHY_INGEST_CHUNK_ROWS,
+            help="Items per Celery chunk with --async (default: DASHY_INGEST_CHUNK_ROWS setting)",
         )
 
     def handle(self, *args, **options):
@@ -51,43 +78,30 @@ class Command(BaseCommand):
         org = self._resolve_org(options)
         self.stdout.write(self.style.NOTICE(f"Using organization: {org.name} (id={org.id})"))
 
-        with file_path.open() as f:
+        if options["run_async"]:
+            job = IngestionJob.objects.create(
+                organization=org,
+                source_type="json",
+                file_name=file_path.name,
+                file_path=str(file_path.resolve()),
+            )
+            ingest_air_quality_file.delay(str(job.id), batch_size, options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(f"Queued ingestion job {job.id}."))
+            return
+
+        with bulk_load_transaction(), file_path.open("rb") as f:
             try:
-                data = json.load(f)
-            except json.JSONDecodeError as exc:
+                ingested = load_items(org.id, iter_items(f), batch_size)
+            except ijson.JSONError as exc:
                 raise CommandError(f"Invalid JSON: {exc}") from exc
+            except ValueError as exc:
+                raise CommandError(str(exc)) from exc
 
-        if not isinstance(data, list):
-            raise CommandError("Expected top-level JSON array")
-
-        rows = []
-        for item in data:
-            recorded_at = parse_datetime(item.get("date", {}).get("utc"))
-            if not recorded_at:
-                continue
-            rows.append(
-                IoTMeasurement(
-                    organization=org,
-                    device_id=item.get("location", "unknown"),
-                    metric=item.get("parameter", "unknown"),
-                    recorded_at=recorded_at,
-                    value=item.get("value"),
-                    tags={
-                        "unit": item.get("unit"),
-                        "country": item.get("country"),
-                        "city": item.get("city"),
-                        "coordinates": item.get("coordinates"),
-                        "location": item.get("location"),
-                    },
-                )
-            )
-
-        if not rows:
+        if not ingested:
             self.stdout.write(self.style.WARNING("No valid rows to ingest."))
             return
 
-        IoTMeasurement.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
-        self.stdout.write(self.style.SUCCESS(f"Ingested {len(rows)} IoT measurements."))
+        self.stdout.write(self.style.SUCCESS(f"Ingested {ingested} IoT measurements."))
 
     def _resolve_org(self, options):
         org_id = options.get("org_id")
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def enable_compression(apps, schema_editor):
+    """Enable TimescaleDB native compression on the IoT hypertable (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    cursor = schema_editor.connection.cursor()
+    # The primary key column must be part of segmentby/orderby, hence the trailing id.
+    cursor.execute(
+        "ALTER TABLE bi_iotmeasurement SET ("
+        "timescaledb.compress, "
+        "timescaledb.compress_segmentby = 'organization_id, device_id, metric', "
+        "timescaledb.compress_orderby = 'recorded_at DESC, id'"
+        ");"
+    )
+    cursor.execute(
+        "SELECT add_compression_policy('bi_iotmeasurement', make_interval(days => %s), if_not_exists => TRUE);",
+        [settings.TIMESCALEDB_COMPRESSION_POLICY_DAYS],
+    )
+
+
+def disable_compression(apps, schema_editor):
+    """Decompress all chunks and turn compression off again (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    cursor = schema_editor.connection.cursor()
+    cursor.execute("SELECT remove_compression_policy('bi_iotmeasurement', if_exists => TRUE);")
+    cursor.execute(
+        "SELECT decompress_chunk(c, if_compressed => TRUE) FROM show_chunks('bi_iotmeasurement') c;"
+    )
+    cursor.execute("ALTER TABLE bi_iotmeasurement SET (timescaledb.compress = false);")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bi", "0004_ingestionjob"),
+    ]
+
+    operations = [
+        migrations.RunPython(enable_compression, disable_compression),
+    ]
@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.db import migrations
+
+COLUMNS = "id, organization_id, device_id, metric, recorded_at, value, tags"
+
+
+def repartition_by_recorded_at(apps, schema_editor):
+    """
+    Rebuild the IoT hypertable partitioned on recorded_at (PostgreSQL only).
+
+    0002 partitioned on the UUID id, which defeats chunk exclusion for time
+    range queries. A hypertable's dimension cannot be changed in place, so the
+    table is recreated, re-partitioned and refilled from the old one.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # TimescaleDB requires the partitioning column in every unique index.
+    _rebuild_hypertable(
+        apps, schema_editor, "id, recorded_at", "by_range('recorded_at', INTERVAL '7 days')"
+    )
+
+
+def repartition_by_id(apps, schema_editor):
+    """Rebuild the IoT hypertable partitioned on id again, as 0002 created it."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    _rebuild_hypertable(apps, schema_editor, "id", "by_range('id', INTERVAL '1 month')")
+
+
+def _rebuild_hypertable(apps, schema_editor, primary_key, dimension):
+    """Recreate bi_iotmeasurement as a hypertable on ``dimension`` and copy the rows over."""
+    model = apps.get_model("bi", "IoTMeasurement")
+    cursor = schema_editor.connection.cursor()
+
+    cursor.execute("SELECT remove_compression_policy('bi_iotmeasurement', if_exists => TRUE);")
+    cursor.execute("ALTER TABLE bi_iotmeasurement RENAME TO bi_iotmeasurement_old;")
+    # Free the primary key's name for the new table.
+    cursor.execute(
+        "ALTER TABLE bi_iotmeasurement_old RENAME CONSTRAINT bi_iotmeasurement_pkey "
+        "TO bi_iotmeasurement_old_pkey;"
+    )
+    cursor.execute(
+        "CREATE TABLE bi_iotmeasurement (LIKE bi_iotmeasurement_old INCLUDING DEFAULTS);"
+    )
+    cursor.execute(f"ALTER TABLE bi_iotmeasurement ADD PRIMARY KEY ({primary_key});")
+    cursor.execute(
+        "ALTER TABLE bi_iotmeasurement ADD CONSTRAINT bi_iotmeasurement_organization_id_fk "
+        "FOREIGN KEY (organization_id) REFERENCES accounts_organization (id) "
+        "DEFERRABLE INITIALLY DEFERRED;"
+    )
+    cursor.execute(
+        f"SELECT create_hypertable('bi_iotmeasurement', {dimension}, create_default_indexes => FALSE);"
+    )
+    cursor.execute(
+        f"INSERT INTO bi_iotmeasurement ({COLUMNS}) SELECT {COLUMNS} FROM bi_iotmeasurement_old;"
+    )
+    cursor.execute("DROP TABLE bi_iotmeasurement_old;")
+
+    # LIKE copies no indexes: recreate the ones Django knows about (the
+    # db_index on recorded_at, the implicit foreign key index and the Meta
+    # indexes) under their original names.
+    for field_name in ("recorded_at", "organization"):
+        schema_editor.execute(
+            schema_editor._create_index_sql(model, fields=[model._meta.get_field(field_name)])
+        )
+    for index in model._meta.indexes:
+        schema_editor.add_index(model, index)
+
+    # Compression settings do not carry over to the new hypertable (see 0005).
+    cursor.execute(
+        "ALTER TABLE bi_iotmeasurement SET ("
+        "timescaledb.compress, "
+        "timescaledb.compress_segmentby = 'organization_id, device_id, metric', "
+        "timescaledb.compress_orderby = 'recorded_at DESC, id'"
+        ");"
+    )
+    cursor.execute(
+        "SELECT add_compression_policy('bi_iotmeasurement', make_interval(days => %s), if_not_exists => TRUE);",
+        [settings.TIMESCALEDB_COMPRESSION_POLICY_DAYS],
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("bi", "0005_enable_timescaledb_compression"),
+    ]
+
+    operations = [
+        migrations.RunPython(repartition_by_recorded_at, repartition_by_id),
+    ]
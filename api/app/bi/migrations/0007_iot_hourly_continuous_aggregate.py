@@ -0,0 +1,71 @@
+# Generated by Django 6.1.2 on 2026-10-15 22:02
+
+from django.db import migrations, models
+
+
+def create_hourly_aggregate(apps, schema_editor):
+    """Create the bi_iot_hourly continuous aggregate and its refresh policy (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    cursor = schema_editor.connection.cursor()
+    # WITH NO DATA lets this run inside the migration transaction; the policy backfills it.
+    cursor.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS bi_iot_hourly
+        WITH (timescaledb.continuous) AS
+        SELECT
+            organization_id,
+            device_id,
+            metric,
+            time_bucket(INTERVAL '1 hour', recorded_at) AS bucket,
+            avg(value) AS avg_value,
+            min(value) AS min_value,
+            max(value) AS max_value,
+            count(*) AS sample_count
+        FROM bi_iotmeasurement
+        GROUP BY organization_id, device_id, metric, bucket
+        WITH NO DATA;
+        """
+    )
+    cursor.execute(
+        "SELECT add_continuous_aggregate_policy('bi_iot_hourly', "
+        "start_offset => INTERVAL '3 days', end_offset => INTERVAL '1 hour', "
+        "schedule_interval => INTERVAL '15 minutes', if_not_exists => TRUE);"
+    )
+
+
+def drop_hourly_aggregate(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    cursor = schema_editor.connection.cursor()
+    cursor.execute("DROP MATERIALIZED VIEW IF EXISTS bi_iot_hourly;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bi', '0006_partition_iotmeasurement_by_recorded_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IoTHourlyAggregate',
+            fields=[
+                ('pk', models.CompositePrimaryKey('organization', 'device_id', 'metric', 'bucket', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('device_id', models.CharField(max_length=255)),
+                ('metric', models.CharField(max_length=255)),
+                ('bucket', models.DateTimeField()),
+                ('avg_value', models.FloatField(null=True)),
+                ('min_value', models.FloatField(null=True)),
+                ('max_value', models.FloatField(null=True)),
+                ('sample_count', models.BigIntegerField()),
+            ],
+            options={
+                'db_table': 'bi_iot_hourly',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_hourly_aggregate, drop_hourly_aggregate),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-15 22:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bi', '0007_iot_hourly_continuous_aggregate'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='iotmeasurement',
+            name='recorded_at',
+            field=models.DateTimeField(),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def create_brin_index(apps, schema_editor):
+    """Add a BRIN index on recorded_at (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    cursor = schema_editor.connection.cursor()
+    # Rows arrive roughly in time order, so block ranges summarise recorded_at
+    # well; the index is a few pages per chunk instead of a full B-tree.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS bi_iot_recorded_at_brin ON bi_iotmeasurement "
+        "USING BRIN (recorded_at) WITH (pages_per_range = 32);"
+    )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    cursor = schema_editor.connection.cursor()
+    cursor.execute("DROP INDEX IF EXISTS bi_iot_recorded_at_brin;")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bi", "0008_remove_iotmeasurement_recorded_at_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_index, drop_brin_index),
+    ]
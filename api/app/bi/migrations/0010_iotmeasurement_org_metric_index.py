@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-15 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_membership_user_role_index'),
+        ('bi', '0009_iotmeasurement_recorded_at_brin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='iotmeasurement',
+            index=models.Index(fields=['organization', 'metric', 'recorded_at'], name='bi_iot_org_metric_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-15 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_membership_user_role_index'),
+        ('bi', '0010_iotmeasurement_org_metric_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='iotmeasurement',
+            index=models.Index(fields=['organization', '-recorded_at', '-id'], name='bi_iot_org_time_id_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from rest_framework.pagination import CursorPagination
+
+
+class MeasurementCursorPagination(CursorPagination):
+    """
+    Keyset pagination over measurements, newest first.
+
+    Opt-in: it only applies when the request passes ``cursor`` or
+    ``page_size``, so existing clients keep receiving a plain list. Each page
+    is a bounded index range scan (``recorded_at < last seen``) rather than an
+    OFFSET that has to walk every earlier row.
+    """
+    page_size = 500
+    page_size_query_param = "page_size"
+    max_page_size = 10000
+    # id breaks ties between rows sharing a timestamp (common for batch
+    # ingests) so pages never repeat or skip rows.
+    ordering = ("-recorded_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,26 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# DRF's encoder covers the types orjson does not (Decimal, lazy strings, ...).
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson.
+
+    Datetimes, UUIDs and plain rows from values() are encoded in C, in the
+    same shape the serializers produce (ISO 8601 with a ``Z`` suffix), so list
+    views can hand over database rows without a serializer pass.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return encode_json(data, orjson.OPT_UTC_Z)
+
+
+def encode_json(data, option: int = 0) -> bytes:
+    """orjson.dumps with DRF's encoder as the fallback for other types."""
+    return orjson.dumps(data, default=_default, option=option)
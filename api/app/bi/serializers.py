@@ -7,6 +7,7 @@ from .models import (
     IndicatorValue,
     Workspace,
     IoTMeasurement,
+    IoTHourlyAggregate,
     IngestionJob,
 )
 
@@ -46,6 +47,37 @@ class IoTMeasurementSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class IoTMeasurementListSerializer(serializers.ModelSerializer):
+    """IoTMeasurement without the tags JSON, for list pages."""
+
+    class Meta:
+        model = IoTMeasurement
+        fields = ["id", "organization", "device_id", "metric", "recorded_at", "value"]
+
+
+class IoTMeasurementTagSerializer(IoTMeasurementListSerializer):
+    """List row plus a single tag value projected by the database."""
+
+    tag_value = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta(IoTMeasurementListSerializer.Meta):
+        fields = IoTMeasurementListSerializer.Meta.fields + ["tag_value"]
+
+
+class IoTHourlyAggregateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = IoTHourlyAggregate
+        fields = [
+            "device_id",
+            "metric",
+            "bucket",
+            "avg_value",
+            "min_value",
+            "max_value",
+            "sample_count",
+        ]
+
+
 class IngestionJobSerializer(serializers.ModelSerializer):
     class Meta:
         model = IngestionJob
@@ -82,3 +114,9 @@ class IngestionJobSerializer(serializers.ModelSerializer):
             "finished_at",
         ]
 
+
+class IngestionJobListSerializer(IngestionJobSerializer):
+    """IngestionJob without the (potentially large) logs, for list pages."""
+
+    class Meta(IngestionJobSerializer.Meta):
+        fields = [f for f in IngestionJobSerializer.Meta.fields if f != "logs"]
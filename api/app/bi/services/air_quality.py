@@ -0,0 +1,152 @@
+"""
+Streaming loader for OpenAQ-style air-quality JSON arrays.
+
+Shared by the ``ingest_air_quality`` management command and the chunked
+Celery tasks, so both build rows the same way.
+"""
+import mmap
+import re
+from itertools import islice
+
+from app.bi.services.bulk import insert_measurements
+from app.bi.services.parsing import ijson_backend, parse_timestamp
+
+# Read the file in large blocks so the C parser is not starved by small reads.
+# A whole-document parser (json/orjson) would be faster per byte but needs the
+# entire file in memory, which is exactly what streaming avoids.
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Opening bracket of the top-level array, after optional whitespace.
+_ARRAY_START_RE = re.compile(rb"\s*\[")
+_EMPTY_ARRAY_REST_RE = re.compile(rb"\s*\]")
+# Everything up to and including the next structural character outside a
+# string: group 1 is an opening bracket, group 2 a comma, neither a closing
+# one. Whole strings are consumed so brackets and commas inside them do not
+# count; the possessive quantifiers keep a truncated string from backtracking.
+_STRUCTURAL_RE = re.compile(
+    rb'[^"\[\]{},]*+(?:"[^"\\]*+(?:\\.[^"\\]*+)*+"[^"\[\]{},]*+)*+(?:([\[{])|(,)|[\]}])'
+)
+
+
+def iter_items(f):
+    """
+    Yield the items of a top-level JSON array one at a time.
+    Raises ValueError if the document is not an array.
+    """
+    events = ijson_backend.parse(f, buf_size=READ_BUFFER_SIZE, use_float=True)
+    _, event, _ = next(events, (None, None, None))
+    if event != "start_array":
+        raise ValueError("Expected top-level JSON array")
+    yield from ijson_backend.items(events, "item")
+
+
+def index_items(f, every: int) -> tuple[int, list[int]]:
+    """
+    Count the items of a top-level JSON array and return the byte offsets of
+    items 0, ``every``, ``2 * every``, ... so chunks can seek straight to
+    their first item. Only the array's structure is scanned; items are not
+    decoded, so malformed values surface when a chunk parses them.
+    Raises ValueError if the document is not a complete array.
+    """
+    if not f.seek(0, 2):
+        raise ValueError("Expected top-level JSON array")
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _scan_array(mm, every)
+
+
+def _scan_array(buf, every):
+    start = _ARRAY_START_RE.match(buf)
+    if start is None:
+        raise ValueError("Expected top-level JSON array")
+    pos = start.end()
+    if _EMPTY_ARRAY_REST_RE.match(buf, pos):
+        return 0, []
+    offsets = [pos]
+    count = 1
+    depth = 1
+    # Anchored matches walk the buffer token by token; a gap means bad JSON.
+    match = _STRUCTURAL_RE.scanner(buf, pos).match
+    while m := match():
+        kind = m.lastindex
+        if kind == 1:
+            depth += 1
+        elif kind == 2:
+            if depth == 1:
+                if count % every == 0:
+                    offsets.append(m.end())
+                count += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return count, offsets
+    # Drop the scanner before raising: it pins the mmap the caller closes.
+    match = None
+    raise ValueError("Unterminated JSON array")
+
+
+def load_items(organization_id: int, items, batch_size: int) -> int:
+    """
+    Insert OpenAQ items into IoTMeasurement in batches of ``batch_size``.
+    Items without a parseable ``date.utc`` are skipped. Returns the row count.
+    """
+    ingested = 0
+    buffer = []
+    append = buffer.append
+    parse = parse_timestamp
+    for item in items:
+        get = item.get
+        recorded_at = parse(get("date", {}).get("utc"))
+        if not recorded_at:
+            continue
+        location = get("location")
+        append(
+            (
+                location or "unknown",
+                get("parameter", "unknown"),
+                recorded_at,
+                get("value"),
+                {
+                    "unit": get("unit"),
+                    "country": get("country"),
+                    "city": get("city"),
+                    "coordinates": get("coordinates"),
+                    "location": location,
+                },
+            )
+        )
+        if len(buffer) >= batch_size:
+            ingested += _flush(organization_id, buffer, batch_size)
+
+    if buffer:
+        ingested += _flush(organization_id, buffer, batch_size)
+    return ingested
+
+
+def load_slice(organization_id: int, f, offset: int, count: int, batch_size: int) -> int:
+    """
+    Insert ``count`` items of the array in ``f`` starting at byte ``offset``,
+    an item offset from ``index_items``. Only this slice is parsed.
+    """
+    f.seek(offset)
+    return load_items(organization_id, islice(iter_items(_ArrayTail(f)), count), batch_size)
+
+
+class _ArrayTail:
+    """Read-only view of ``f`` from its current position with a ``[`` in front."""
+
+    def __init__(self, f):
+        self._f = f
+        self._head = b"["
+
+    def read(self, size=-1):
+        if not size or not self._head:
+            return self._f.read(size)
+        head, self._head = self._head, b""
+        return head + self._f.read(size - 1 if size > 0 else size)
+
+
+def _flush(organization_id, buffer, batch_size):
+    """Insert the buffered rows and empty the buffer; returns the row count."""
+    count = insert_measurements(organization_id, buffer, batch_size)
+    buffer.clear()
+    return count
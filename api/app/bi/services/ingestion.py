@@ -1,6 +1,5 @@
 import csv
 import requests
-import datetime
 from django.utils.timezone import now
 
 def run_ingestion(job):
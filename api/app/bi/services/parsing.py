@@ -0,0 +1,46 @@
+"""
+Fast parsers shared by the ingestion paths.
+"""
+from datetime import datetime
+
+import ijson
+
+# Pin the libyajl C backend: the pure-Python fallback ijson picks when the
+# extension is missing is several times slower than json.load. The published
+# ijson wheels ship the extension, so the fallback only applies to odd builds.
+try:
+    import ijson.backends.yajl2_c as ijson_backend
+except ImportError:  # pragma: no cover
+    ijson_backend = ijson
+
+_fromisoformat = datetime.fromisoformat
+
+
+def parse_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp such as ``2025-01-01T00:00:00.000Z``.
+
+    Uses the C implementation of ``datetime.fromisoformat`` (which accepts the
+    full ISO 8601 syntax since Python 3.11) rather than Django's regex-based
+    ``parse_datetime``. Returns None when the value is missing or invalid.
+    """
+    try:
+        return _fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def peek_json_kind(f) -> str:
+    """
+    Return "array", "object" or "other" from the first non-whitespace byte of
+    the file, then rewind it. Avoids starting a parser just to pick a path.
+    """
+    try:
+        while block := f.read(4096):
+            stripped = block.lstrip(b" \t\r\n")
+            if stripped:
+                first = stripped[:1]
+                return "array" if first == b"[" else "object" if first == b"{" else "other"
+        return "other"
+    finally:
+        f.seek(0)
@@ -3,52 +3,167 @@ Celery tasks for background data ingestion.
 """
 import csv
 import io
-import json
+import mmap
 import os
+import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from operator import itemgetter
 
-from celery import shared_task
-from django.db import transaction
+import orjson
+from celery import chord, shared_task
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Concat
 from django.utils import timezone
 
-from .models import IngestionJob, IoTMeasurement
+from .models import IngestionJob
+from .services.air_quality import READ_BUFFER_SIZE, index_items, load_slice
+from .services.bulk import bulk_load_transaction, insert_measurements
+from .services.parsing import ijson_backend, parse_timestamp, peek_json_kind
 
 
-# Column name mappings for flexible CSV parsing
-DEVICE_ID_COLUMNS = ["device_id", "deviceid", "device", "location", "sensor", "sensor_id", "name"]
-METRIC_COLUMNS = ["metric", "parameter", "measurement", "type", "metric_name"]
-TIMESTAMP_COLUMNS = ["recorded_at", "timestamp", "time", "datetime", "date", "created_at"]
-VALUE_COLUMNS = ["value", "reading", "measurement", "amount"]
-SKIP_KEYS = set(DEVICE_ID_COLUMNS + METRIC_COLUMNS + TIMESTAMP_COLUMNS + VALUE_COLUMNS + ["tags"])
+# Column name mappings for flexible CSV parsing, in priority order. Immutable:
+# they are only read, once per file, when the header is resolved.
+DEVICE_ID_COLUMNS = ("device_id", "deviceid", "device", "location", "sensor", "sensor_id", "name")
+METRIC_COLUMNS = ("metric", "parameter", "measurement", "type", "metric_name")
+TIMESTAMP_COLUMNS = ("recorded_at", "timestamp", "time", "datetime", "date", "created_at")
+VALUE_COLUMNS = ("value", "reading", "measurement", "amount")
+SKIP_KEYS = frozenset(DEVICE_ID_COLUMNS + METRIC_COLUMNS + TIMESTAMP_COLUMNS + VALUE_COLUMNS + ("tags",))
 
 
-def _log(job: IngestionJob, message: str):
-    """Append a timestamped log entry to the job."""
-    timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
-    job.logs += f"[{timestamp}] {message}\n"
-    job.save(update_fields=["logs"])
+# Upload names that mark a JSON file as newline-delimited (one item per line).
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+# Bytes looked at on either side of the first line break when sniffing NDJSON.
+NDJSON_SNIFF_BYTES = 4096
+
+
+# Status/counter columns written when a job finishes. Saves list their fields
+# explicitly so they never write back the in-memory copy of ``logs``.
+JOB_STATE_FIELDS = ["status", "progress", "processed_rows", "failed_rows", "error_message", "finished_at"]
+# On failure the counters are left as the last progress flush wrote them.
+JOB_FAILURE_FIELDS = ["status", "error_message", "finished_at"]
+
+
+class PartialIngestionError(Exception):
+    """
+    Reading the rows failed after some batches had already been committed.
+    Streamed files are inserted as they are parsed, so a late syntax error
+    cannot undo the earlier batches; the message says how many there were.
+    """
+
+    def __init__(self, cause: Exception, created: int, failed: int):
+        super().__init__(f"{cause} ({created} rows were committed before the error)")
+        self.created = created
+        self.failed = failed
+
+
+class _LogBuffer:
+    """
+    Collects a job's log lines and processed-row increments and writes them
+    together in one UPDATE, at most every FLUSH_INTERVAL seconds or once
+    MAX_PENDING lines are waiting. Logs are appended and counters incremented
+    in the database, so concurrent writers never clobber each other.
+    """
+    FLUSH_INTERVAL = 2.0
+    MAX_PENDING = 16
+
+    def __init__(self, job: IngestionJob):
+        self.job = job
+        self.lines = []
+        self.processed_delta = 0
+        self.progress = None
+        self.last_flush = time.monotonic()
+
+    def log(self, line: str):
+        self.lines.append(line)
+        self._maybe_flush()
+
+    def add_progress(self, processed_delta: int, progress: int | None = None):
+        """
+        Count ``processed_delta`` more rows. Without an explicit ``progress``
+        it is derived from ``total_rows``, which must then be set.
+        """
+        self.processed_delta += processed_delta
+        self.progress = progress
+        self._maybe_flush()
 
+    def _maybe_flush(self):
+        if len(self.lines) >= self.MAX_PENDING or time.monotonic() - self.last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
 
-def _update_progress(job: IngestionJob, processed: int, total: int):
-    """Update job progress."""
-    job.processed_rows = processed
-    job.total_rows = total
-    job.progress = int((processed / total) * 100) if total > 0 else 0
-    job.save(update_fields=["processed_rows", "total_rows", "progress"])
+    def flush(self):
+        updates = {}
+        if self.lines:
+            updates["logs"] = Concat(F("logs"), Value("".join(self.lines)))
+        if self.processed_delta:
+            processed = F("processed_rows") + self.processed_delta
+            updates["processed_rows"] = processed
+            updates["progress"] = processed * 100 / F("total_rows") if self.progress is None else self.progress
+        if updates:
+            IngestionJob.objects.filter(pk=self.job.pk).update(**updates)
+        self.lines.clear()
+        self.processed_delta = 0
+        self.last_flush = time.monotonic()
 
 
-def _get_first_match(row_dict: dict, columns: list, default: str = "") -> str:
-    """Get the first matching value from a list of possible column names."""
-    for col in columns:
-        val = row_dict.get(col)
+def _log_buffer(job: IngestionJob) -> _LogBuffer:
+    """The job's _LogBuffer, created on first use."""
+    buffer = getattr(job, "_log_buffer", None)
+    if buffer is None:
+        buffer = job._log_buffer = _LogBuffer(job)
+    return buffer
+
+
+def _log(job: IngestionJob, message: str):
+    """
+    Append a timestamped log entry to the job (written on the next flush).
+
+    Lines are only collected in the buffer and concatenated in the database;
+    ``job.logs`` in memory is not updated, since growing it one line at a
+    time would copy the whole log on every call.
+    """
+    timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
+    _log_buffer(job).log(f"[{timestamp}] {message}\n")
+
+
+def _get_first_match(row: list, idxs: tuple, default: str = "") -> str:
+    """Get the first non-empty value among the given column positions."""
+    for i in idxs:
+        val = row[i]
         if val:
-            return str(val).strip()
+            return val.strip()
     return default
 
 
-def _parse_openaq_format(data: list, org) -> list:
+def _column_indices(positions: dict, columns: tuple) -> tuple:
+    """Positions of the header columns in ``columns``, in ``columns``' priority order."""
+    return tuple(positions[col] for col in columns if col in positions)
+
+
+def _csv_layout(header: list) -> tuple:
+    """
+    Resolve a CSV header once into the column positions _parse_csv_row reads:
+    (device, metric, timestamp, value) position tuples, the ``tags`` column
+    position (or None) and the (name, position) pairs copied into tags.
+    """
+    header_lower = [h.lower() for h in header]
+    # Later duplicates win, as they did with DictReader.
+    positions = {h: i for i, h in enumerate(header_lower)}
+    return (
+        _column_indices(positions, DEVICE_ID_COLUMNS),
+        _column_indices(positions, METRIC_COLUMNS),
+        _column_indices(positions, TIMESTAMP_COLUMNS),
+        _column_indices(positions, VALUE_COLUMNS),
+        positions.get("tags"),
+        tuple((h, i) for h, i in positions.items() if h not in SKIP_KEYS),
+    )
+
+
+def _iter_openaq_measurements(items):
     """
-    Parse OpenAQ-style JSON array format.
+    Yield measurement rows for OpenAQ-style items, one at a time.
     Example:
     [
       {
@@ -63,36 +178,45 @@ def _parse_openaq_format(data: list, org) -> list:
       }
     ]
     """
-    objs = []
-    for item in data:
-        device_id = str(item.get("location", "")).strip()
-        metric = str(item.get("parameter", "")).strip()
+    _str = str
+    _dict = dict
+    parse = parse_timestamp
+    for item in items:
+        get = item.get
+        device_id = _str(get("location", "")).strip()
+        metric = _str(get("parameter", "")).strip()
         
         # Handle date - can be nested or direct
-        date_obj = item.get("date", {})
-        recorded_at = date_obj.get("utc") or date_obj.get("local") if isinstance(date_obj, dict) else date_obj
+        date_obj = get("date", {})
+        recorded_at = date_obj.get("utc") or date_obj.get("local") if type(date_obj) is _dict else date_obj
+        # Parsed here, once, so the model field never has to; bad dates are skipped.
+        recorded_at = parse(recorded_at)
         
         if not device_id or not metric or not recorded_at:
             continue
         
-        # Build tags from available metadata
-        tags = {key: item[key] for key in ["city", "country", "unit", "location", "coordinates"] 
-                if key in item and item[key] is not None}
+        # Build tags from available metadata; one lookup per key.
+        tags = {}
+        v = get("city")
+        if v is not None:
+            tags["city"] = v
+        v = get("country")
+        if v is not None:
+            tags["country"] = v
+        v = get("unit")
+        if v is not None:
+            tags["unit"] = v
+        v = get("location")
+        if v is not None:
+            tags["location"] = v
+        v = get("coordinates")
+        if v is not None:
+            tags["coordinates"] = v
         
-        objs.append(
-            IoTMeasurement(
-                organization=org,
-                device_id=device_id,
-                metric=metric,
-                recorded_at=recorded_at,
-                value=item.get("value"),
-                tags=tags,
-            )
-        )
-    return objs
+        yield device_id, metric, recorded_at, get("value"), tags
 
 
-def _parse_standard_format(data: dict, org) -> list:
+def _parse_standard_format(data: dict) -> list:
     """
     Parse standard format with device_id, metric, rows.
     Example:
@@ -112,34 +236,26 @@ def _parse_standard_format(data: dict, org) -> list:
     for r in rows:
         row_device = str(r.get("device_id") or device_id or "").strip()
         row_metric = str(r.get("metric") or metric or "").strip()
-        row_recorded_at = r.get("recorded_at")
+        row_recorded_at = parse_timestamp(r.get("recorded_at"))
         
         if not row_device or not row_metric or not row_recorded_at:
             continue
         
-        objs.append(
-            IoTMeasurement(
-                organization=org,
-                device_id=row_device,
-                metric=row_metric,
-                recorded_at=row_recorded_at,
-                value=r.get("value"),
-                tags=r.get("tags", {}),
-            )
-        )
+        objs.append((row_device, row_metric, row_recorded_at, r.get("value"), r.get("tags", {})))
     return objs
 
 
-def _parse_csv_row(row_lower: dict, org) -> IoTMeasurement | None:
-    """Parse a single CSV row into an IoTMeasurement object."""
-    device_id = _get_first_match(row_lower, DEVICE_ID_COLUMNS)
-    recorded_at = _get_first_match(row_lower, TIMESTAMP_COLUMNS)
+def _parse_csv_row(row: list, layout: tuple) -> tuple | None:
+    """Parse a single CSV row (padded to the header width) into a measurement row."""
+    device_idxs, metric_idxs, timestamp_idxs, value_idxs, tags_idx, tag_cols = layout
+    device_id = _get_first_match(row, device_idxs)
+    recorded_at = parse_timestamp(_get_first_match(row, timestamp_idxs))
     
     if not device_id or not recorded_at:
         return None
     
-    metric = _get_first_match(row_lower, METRIC_COLUMNS, "unknown")
-    value_str = _get_first_match(row_lower, VALUE_COLUMNS)
+    metric = _get_first_match(row, metric_idxs, "unknown")
+    value_str = _get_first_match(row, value_idxs)
     
     # Parse value
     value = None
@@ -150,158 +266,366 @@ def _parse_csv_row(row_lower: dict, org) -> IoTMeasurement | None:
             pass
     
     # Build tags from remaining columns
-    tags = {key: val for key, val in row_lower.items() if key not in SKIP_KEYS and val}
+    tags = {key: row[i] for key, i in tag_cols if row[i]}
     
     # Try to parse tags column if present
-    tags_str = row_lower.get("tags", "")
+    tags_str = row[tags_idx] if tags_idx is not None else ""
     if tags_str:
         try:
-            parsed_tags = json.loads(tags_str)
+            parsed_tags = orjson.loads(tags_str)
             if isinstance(parsed_tags, dict):
                 tags.update(parsed_tags)
-        except (json.JSONDecodeError, TypeError):
+        except (orjson.JSONDecodeError, TypeError):
             pass
     
-    return IoTMeasurement(
-        organization=org,
-        device_id=device_id,
-        metric=metric,
-        recorded_at=recorded_at,
-        value=value,
-        tags=tags if tags else None,
+    return device_id, metric, recorded_at, value, tags if tags else None
+
+
+def _parse_simple_csv_rows(reader, width: int, layout: tuple) -> list:
+    """
+    Fast path of _parse_generic_csv for the common header where every field
+    maps to at most one column and there is no JSON ``tags`` column.
+
+    One itemgetter call pulls the four fields out of a row in C, so the loop
+    does no per-column lookups and no call per row; results are identical to
+    _parse_csv_row's.
+    """
+    (device_idx,), metric_idxs, (timestamp_idx,), value_idxs, _, tag_cols = layout
+    has_metric = bool(metric_idxs)
+    has_value = bool(value_idxs)
+    # A field without a column reads the device column and is then ignored.
+    fields = itemgetter(
+        device_idx,
+        metric_idxs[0] if has_metric else device_idx,
+        timestamp_idx,
+        value_idxs[0] if has_value else device_idx,
     )
+    padding = [""] * width
+    objs = []
+    append = objs.append
+    _float = float
+    parse = parse_timestamp
+    for row in reader:
+        if len(row) < width:
+            row += padding[len(row):]
+        device_id, metric, recorded_at, value_str = fields(row)
+        device_id = device_id.strip()
+        recorded_at = parse(recorded_at.strip())
+        if not device_id or not recorded_at:
+            continue
+        value = None
+        if has_value and value_str:
+            try:
+                value = _float(value_str)
+            except ValueError:
+                pass
+        tags = {key: row[i] for key, i in tag_cols if row[i]} if tag_cols else None
+        metric = metric.strip() if has_metric and metric else "unknown"
+        append((device_id, metric, recorded_at, value, tags or None))
+    return objs
 
 
-def _parse_generic_csv(content: str, org) -> list:
+def _parse_generic_csv(f) -> list:
     """
-    Parse CSV with flexible column mapping.
+    Parse CSV from a text file object with flexible column mapping.
     Tries to map common column names to our schema.
     """
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if not header:
+        return []
+    return _parse_csv_rows(reader, header)
+
+
+def _parse_csv_rows(reader, header: list) -> list:
+    """Parse the data rows of a csv.reader against an already-read header."""
     objs = []
-    reader = csv.DictReader(io.StringIO(content))
-    
+    layout = _csv_layout(header)
+    device_idxs, metric_idxs, timestamp_idxs, value_idxs, tags_idx, _ = layout
+    if not device_idxs or not timestamp_idxs:
+        # Every row would be skipped for lacking a device or timestamp.
+        return objs
+    width = len(header)
+    single = len(device_idxs) == len(timestamp_idxs) == 1 and len(metric_idxs) <= 1 and len(value_idxs) <= 1
+    if single and tags_idx is None:
+        return _parse_simple_csv_rows(reader, width, layout)
+
+    padding = [""] * width
+    parse_row = _parse_csv_row
+    append = objs.append
     for row in reader:
-        row_lower = {k.lower(): v for k, v in row.items()}
-        measurement = _parse_csv_row(row_lower, org)
+        if len(row) < width:
+            row += padding[len(row):]
+        measurement = parse_row(row, layout)
         if measurement:
-            objs.append(measurement)
+            append(measurement)
     
     return objs
 
 
-def _parse_json_content(content: str, org, job: IngestionJob) -> list:
-    """Parse JSON content and return list of IoTMeasurement objects."""
-    data = json.loads(content)
-    
-    if isinstance(data, list):
-        _log(job, f"Detected array format with {len(data)} items")
-        return _parse_openaq_format(data, org)
-    
+def _parse_csv_range(path: str, header: list, start: int, end: int) -> list:
+    """Parse the data rows in bytes ``[start, end)`` of a CSV file (process pool worker)."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return _parse_csv_rows(csv.reader(io.StringIO(data.decode("utf-8"), newline="")), header)
+
+
+def _parse_csv_parallel(path: str, processes: int) -> list:
+    """
+    Parse a large CSV file in ``processes`` worker processes.
+
+    The data rows are split into byte ranges on line boundaries and each
+    range is parsed against the header read here, so CPU-bound row parsing
+    is not serialized on one interpreter. Ranges are cut at raw newlines, so
+    the file must not have line breaks inside quoted fields.
+    """
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), None)
+        if not header:
+            return []
+        bounds = [f.tell()]
+        size = os.fstat(f.fileno()).st_size
+        step = (size - bounds[0]) // processes
+        for k in range(1, processes):
+            f.seek(max(bounds[0] + k * step, bounds[-1]))
+            f.readline()
+            if f.tell() >= size:
+                break
+            if f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+        bounds.append(size)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for part in pool.map(_parse_csv_range, repeat(path), repeat(header), bounds, bounds[1:]):
+            rows.extend(part)
+    return rows
+
+
+def _is_ndjson(f) -> bool:
+    """
+    Sniff newline-delimited JSON without parsing it: the first line ends in
+    ``}`` and the next non-blank byte after it is ``{``. Only the end of the
+    first line and the start of the next are read, so a minified one-line
+    document is not decoded here and again by the real parser.
+    """
+    # Checked first so a one-line array is never read in as a "line".
+    if peek_json_kind(f) != "object":
+        return False
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = mm.find(b"\n")
+        if end < 0 or not mm[max(0, end - NDJSON_SNIFF_BYTES):end].rstrip().endswith(b"}"):
+            return False
+        for pos in range(end + 1, len(mm), NDJSON_SNIFF_BYTES):
+            rest = mm[pos:pos + NDJSON_SNIFF_BYTES].lstrip()
+            if rest:
+                return rest[:1] == b"{"
+    return False
+
+
+def _parse_ndjson_content(f, job: IngestionJob):
+    """
+    Stream measurement rows from newline-delimited JSON, one OpenAQ-style
+    object per line. Each line is a small, independent document, so orjson
+    parses it directly and memory stays bounded by one insert batch.
+    """
+    _log(job, "Detected NDJSON format, streaming lines")
+    loads = orjson.loads
+    return _iter_openaq_measurements(loads(line) for line in f if not line.isspace())
+
+
+def _parse_json_content(f, job: IngestionJob):
+    """
+    Parse a JSON file into measurement rows.
+
+    Top-level arrays are streamed: items are parsed and yielded one at a time,
+    so memory stays bounded by one insert batch. Objects are loaded whole.
+    """
+    if peek_json_kind(f) == "array":
+        _log(job, "Detected array format, streaming items")
+        items = ijson_backend.items(f, "item", buf_size=READ_BUFFER_SIZE, use_float=True)
+        return _iter_openaq_measurements(items)
+
+    # Parse straight from the page cache instead of copying the file into bytes.
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        data = orjson.loads(view)
     if isinstance(data, dict):
         if "rows" in data:
             _log(job, "Detected standard format with rows")
-            return _parse_standard_format(data, org)
+            return _parse_standard_format(data)
         _log(job, "Detected single object, treating as array")
-        return _parse_openaq_format([data], org)
+        return list(_iter_openaq_measurements([data]))
     
     raise ValueError(f"Unsupported JSON structure: {type(data)}")
 
 
-def _bulk_insert_measurements(objs: list, job: IngestionJob, batch_size: int = 1000) -> tuple[int, int]:
-    """Bulk insert measurements in batches. Returns (created, failed) counts."""
-    total_rows = len(objs)
+def _parse_job_file(job: IngestionJob, f, size: int):
+    """
+    Parse the job's file with the parser for its format.
+
+    Returns ``(rows, progress)``. Rows are a list when the file was parsed up
+    front. Streamed formats return a lazy iterator instead, with ``progress``
+    reporting how far through the file the parser is, since the row count is
+    not known in advance.
+    """
+    if job.source_type == "csv":
+        return _parse_csv_file(job, f, size), None
+    if job.source_type != "json":
+        raise ValueError(f"Unsupported source type: {job.source_type}")
+
+    if (job.file_name or "").lower().endswith(NDJSON_EXTENSIONS) or _is_ndjson(f):
+        rows = _parse_ndjson_content(f, job)
+    else:
+        rows = _parse_json_content(f, job)
+    if isinstance(rows, list):
+        return rows, None
+
+    def progress():
+        # Capped until the insert loop finishes.
+        return min(99, f.tell() * 100 // size) if size else 0
+
+    return rows, progress
+
+
+def _parse_csv_file(job: IngestionJob, f, size: int) -> list:
+    """Parse a CSV job file, in a process pool when it is large enough."""
+    processes = settings.DASHY_CSV_PARSE_PROCESSES
+    if processes > 1 and size >= settings.DASHY_CSV_PARALLEL_MIN_BYTES:
+        _log(job, f"Parsing CSV content in {processes} processes")
+        return _parse_csv_parallel(job.file_path, processes)
+
+    _log(job, "Parsing CSV content")
+    # Decode while reading rather than materializing the whole file as a str.
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    try:
+        return _parse_generic_csv(text)
+    finally:
+        text.detach()
+
+
+def _bulk_insert_measurements(rows, job: IngestionJob, batch_size: int | None = None, progress=None) -> tuple[int, int]:
+    """
+    Bulk insert measurement rows in batches. Returns (created, failed) counts.
+
+    ``rows`` are the ``(device_id, metric, recorded_at, value, tags)`` tuples
+    the parsers produce, from any iterable, consumed ``batch_size`` (default
+    DASHY_BULK_BATCH_SIZE) at a time. Model instances are only built per
+    batch, and only where COPY is not available. For streams of unknown
+    length pass ``progress``, a callable returning the percentage done,
+    instead of relying on ``total_rows``.
+
+    Each batch is a single COPY (or a bulk_create, which is atomic on its
+    own) running in autocommit, so a failed batch is rolled back by itself
+    without an extra BEGIN/COMMIT or savepoint around every batch.
+    """
+    batch_size = batch_size or settings.DASHY_BULK_BATCH_SIZE
     created = 0
     failed = 0
+    it = iter(rows)
+    batch_no = 0
+    buffer = _log_buffer(job)
+    org_id = job.organization_id
     
-    for i in range(0, total_rows, batch_size):
-        batch = objs[i:i + batch_size]
-        try:
-            with transaction.atomic():
-                IoTMeasurement.objects.bulk_create(batch, batch_size=batch_size, ignore_conflicts=True)
-            created += len(batch)
-        except Exception as e:
-            _log(job, f"Batch {i // batch_size + 1} failed: {e!s}")
-            failed += len(batch)
-        
-        _update_progress(job, created + failed, total_rows)
+    try:
+        while batch := list(islice(it, batch_size)):
+            batch_no += 1
+            try:
+                insert_measurements(org_id, batch, batch_size)
+                created += len(batch)
+            except Exception as e:
+                _log(job, f"Batch {batch_no} failed: {e!s}")
+                failed += len(batch)
+            
+            buffer.add_progress(len(batch), progress() if progress else None)
+    except Exception as e:
+        # Only reading ``rows`` can get here; insert errors are handled above.
+        # Flush first so pending increments do not land on top of the
+        # counts the caller saves.
+        buffer.flush()
+        if created:
+            raise PartialIngestionError(e, created, failed) from e
+        raise
     
+    # Write the remaining increments before the caller saves final counts.
+    buffer.flush()
     return created, failed
 
 
 def _cleanup_temp_file(file_path: str | None, job: IngestionJob):
     """Clean up temporary file if it exists."""
-    if file_path and os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-            _log(job, "Cleaned up temporary file")
-        except OSError:
-            pass
+    if not file_path:
+        return
+    try:
+        os.remove(file_path)
+    except OSError:  # Includes FileNotFoundError: nothing to clean up.
+        return
+    _log(job, "Cleaned up temporary file")
 
 
-@shared_task(bind=True)
+@shared_task(bind=True, acks_late=True)
 def process_ingestion_job(self, job_id: str):
     """
     Process a data ingestion job in the background.
     """
-    try:
-        job = IngestionJob.objects.get(id=job_id)
-    except IngestionJob.DoesNotExist:
-        return {"error": f"Job {job_id} not found"}
+    # Claim the job atomically. With acks_late a task that died mid-run is
+    # delivered again, but its batches were already committed: only the
+    # first delivery may move the job out of "pending", so a redelivery
+    # never inserts the same rows twice.
+    claimed = IngestionJob.objects.filter(id=job_id, status="pending").update(
+        status="processing", started_at=timezone.now(), celery_task_id=self.request.id
+    )
+    if not claimed:
+        if not IngestionJob.objects.filter(id=job_id).exists():
+            return {"error": f"Job {job_id} not found"}
+        return {"skipped": "job already claimed", "job_id": job_id}
     
-    # Update status to processing
-    job.status = "processing"
-    job.started_at = timezone.now()
-    job.celery_task_id = self.request.id
-    job.save()
+    # logs can grow large and the task only ever appends to it in the database.
+    job = IngestionJob.objects.defer("logs").get(id=job_id)
     _log(job, f"Started processing {job.source_type} file: {job.file_name}")
     
     try:
-        org = job.organization
-        if not org:
+        if not job.organization_id:
             raise ValueError("Job has no associated organization")
         
-        if not job.file_path or not os.path.exists(job.file_path):
-            raise FileNotFoundError(f"File not found: {job.file_path}")
-        
-        with open(job.file_path, encoding="utf-8") as f:
-            content = f.read()
-        
-        _log(job, f"Read {len(content)} bytes from file")
-        
-        # Parse content based on source type
-        if job.source_type == "json":
-            objs = _parse_json_content(content, org, job)
-        elif job.source_type == "csv":
-            _log(job, "Parsing CSV content")
-            objs = _parse_generic_csv(content, org)
-        else:
-            raise ValueError(f"Unsupported source type: {job.source_type}")
+        # Open directly rather than checking exists() first: one syscall, no race.
+        try:
+            f = open(job.file_path or "", "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {job.file_path}") from None
         
-        total_rows = len(objs)
-        _log(job, f"Parsed {total_rows} valid records")
-        job.total_rows = total_rows
-        job.save(update_fields=["total_rows"])
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            _log(job, f"Reading {size} bytes from file")
+            objs, progress = _parse_job_file(job, f, size)
+            
+            if progress is None:
+                _log(job, f"Parsed {len(objs)} valid records")
+                job.total_rows = len(objs)
+                job.save(update_fields=["total_rows"])
+            
+            # Bulk insert in batches
+            created, failed = _bulk_insert_measurements(objs, job, progress=progress)
         
-        if total_rows == 0:
+        if created + failed == 0:
             job.status = "completed"
             job.progress = 100
             job.finished_at = timezone.now()
-            job.save()
+            job.save(update_fields=JOB_STATE_FIELDS)
             _log(job, "No valid records found to insert")
+            _cleanup_temp_file(job.file_path, job)
             return {"created": 0, "job_id": str(job.id)}
         
-        # Bulk insert in batches
-        created, failed = _bulk_insert_measurements(objs, job)
-        
         _cleanup_temp_file(job.file_path, job)
         
         # Update final status
         job.status = "completed"
         job.progress = 100
+        job.total_rows = created + failed
         job.processed_rows = created
         job.failed_rows = failed
         job.finished_at = timezone.now()
-        job.save()
+        job.save(update_fields=JOB_STATE_FIELDS + ["total_rows"])
         _log(job, f"Completed: {created} records created, {failed} failed")
         
         return {"created": created, "failed": failed, "job_id": str(job.id)}
@@ -310,7 +634,91 @@ def process_ingestion_job(self, job_id: str):
         job.status = "failed"
         job.error_message = str(e)
         job.finished_at = timezone.now()
-        job.save()
+        update_fields = JOB_FAILURE_FIELDS
+        if isinstance(e, PartialIngestionError):
+            job.processed_rows = e.created
+            job.failed_rows = e.failed
+            update_fields = JOB_FAILURE_FIELDS + ["processed_rows", "failed_rows"]
+        job.save(update_fields=update_fields)
         _log(job, f"Error: {e!s}\n{traceback.format_exc()}")
         _cleanup_temp_file(job.file_path, job)
         return {"error": str(e), "job_id": str(job.id)}
+    finally:
+        _log_buffer(job).flush()
+
+
+@shared_task(bind=True)
+def ingest_air_quality_file(self, job_id: str, batch_size: int, chunk_size: int):
+    """
+    Load a large OpenAQ JSON array by fanning it out to ``ingest_chunk`` tasks.
+    The file is read in place and must be reachable from every worker.
+    """
+    job = IngestionJob.objects.defer("logs").get(id=job_id)
+    job.status = "processing"
+    job.started_at = timezone.now()
+    job.celery_task_id = self.request.id
+    try:
+        with open(job.file_path, "rb") as f:
+            job.total_rows, offsets = index_items(f, chunk_size)
+    except Exception as e:
+        job.status = "failed"
+        job.error_message = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=JOB_FAILURE_FIELDS)
+        _log(job, f"Error: {e!s}")
+        _log_buffer(job).flush()
+        return {"error": str(e), "job_id": job_id}
+    job.save(update_fields=["status", "started_at", "celery_task_id", "total_rows"])
+    _log(job, f"Counted {job.total_rows} items, loading in chunks of {chunk_size}")
+    _log_buffer(job).flush()
+
+    chunks = [
+        ingest_chunk.s(job_id, job.file_path, offset, min(chunk_size, job.total_rows - i * chunk_size), batch_size)
+        for i, offset in enumerate(offsets)
+    ]
+    if chunks:
+        chord(chunks)(finish_air_quality_ingest.s(job_id).on_error(fail_air_quality_ingest.s(job_id)))
+    else:
+        finish_air_quality_ingest.delay([], job_id)
+    return {"chunks": len(chunks), "job_id": job_id}
+
+
+# Acked on receipt, unlike the other tasks: a chunk commits its rows, so a
+# redelivery after a lost ack would insert the whole slice a second time.
+@shared_task(acks_late=False)
+def ingest_chunk(job_id: str, file_path: str, offset: int, count: int, batch_size: int) -> int:
+    """Insert ``count`` items of the job's JSON array starting at byte ``offset``."""
+    job = IngestionJob.objects.only("organization_id").get(id=job_id)
+    with bulk_load_transaction(), open(file_path, "rb") as f:
+        created = load_slice(job.organization_id, f, offset, count, batch_size)
+    # Bumped after the chunk commits so parallel chunks never wait on the job row lock.
+    IngestionJob.objects.filter(id=job_id).update(processed_rows=F("processed_rows") + created)
+    return created
+
+
+@shared_task
+def finish_air_quality_ingest(created_counts: list, job_id: str):
+    """Chord callback: mark the chunked job as completed."""
+    created = sum(created_counts)
+    job = IngestionJob.objects.defer("logs").get(id=job_id)
+    job.status = "completed"
+    job.progress = 100
+    job.processed_rows = created
+    job.failed_rows = job.total_rows - created
+    job.finished_at = timezone.now()
+    job.save(update_fields=JOB_STATE_FIELDS)
+    _log(job, f"Completed: {created} records created, {job.failed_rows} skipped")
+    _log_buffer(job).flush()
+    return {"created": created, "job_id": job_id}
+
+
+@shared_task
+def fail_air_quality_ingest(request, exc, tb, job_id: str):
+    """Chord error callback: mark the chunked job as failed."""
+    job = IngestionJob.objects.defer("logs").get(id=job_id)
+    job.status = "failed"
+    job.error_message = str(exc)
+    job.finished_at = timezone.now()
+    job.save(update_fields=JOB_FAILURE_FIELDS)
+    _log(job, f"Error: {exc!s}")
+    _log_buffer(job).flush()
@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from app.accounts.models import Organization
+from app.bi.models import IngestionJob, IoTMeasurement
+from app.bi.services.air_quality import index_items
+from app.bi.tasks import fail_air_quality_ingest, ingest_chunk
+
+
+class IngestAirQualityCommandTests(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Air Org")
+
+    def _write(self, payload):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            f.write(payload if isinstance(payload, str) else json.dumps(payload))
+        self.addCleanup(os.remove, path)
+        return path
+
+    def _run(self, path, **options):
+        out = StringIO()
+        call_command(
+            "ingest_air_quality", file_path=path, org_id=self.org.id, stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_ingests_in_batches(self):
+        items = [
+            {
+                "location": f"station-{i}",
+                "parameter": "pm25",
+                "date": {"utc": "2025-01-01T00:00:00Z"},
+                "value": 1.5 + i,
+                "coordinates": {"latitude": -45.57, "longitude": -72.06},
+            }
+            for i in range(5)
+        ]
+        items.append({"location": "no-date", "parameter": "pm25", "value": 1})
+        path = self._write(items)
+
+        out = self._run(path, batch_size=2)
+
+        self.assertIn("Ingested 5 IoT measurements.", out)
+        qs = IoTMeasurement.objects.filter(organization=self.org)
+        self.assertEqual(qs.count(), 5)
+        m = qs.get(device_id="station-0")
+        self.assertEqual(m.value, 1.5)
+        self.assertEqual(m.tags["coordinates"], {"latitude": -45.57, "longitude": -72.06})
+
+    def test_rejects_non_array(self):
+        path = self._write({"location": "x"})
+        with self.assertRaisesMessage(CommandError, "Expected top-level JSON array"):
+            self._run(path)
+
+    def test_rejects_invalid_json(self):
+        path = self._write('[{"location": ')
+        with self.assertRaisesMessage(CommandError, "Invalid JSON"):
+            self._run(path)
+
+
+class ChunkedAirQualityIngestTests(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Chunk Org")
+        items = [
+            {"location": f"station-{i}", "parameter": "pm25", "date": {"utc": "2025-01-01T00:00:00Z"}, "value": i}
+            for i in range(7)
+        ]
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(items, f)
+        self.addCleanup(os.remove, self.path)
+        self.job = IngestionJob.objects.create(organization=self.org, source_type="json", file_path=self.path)
+
+    def test_index_items(self):
+        with open(self.path, "rb") as f:
+            count, offsets = index_items(f, 3)
+            self.assertEqual(count, 7)
+            self.assertEqual(len(offsets), 3)
+            f.seek(offsets[1])
+            self.assertTrue(f.read(40).lstrip().startswith(b'{"location": "station-3"'))
+
+    def test_index_items_ignores_brackets_in_strings(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b' [{"a": "x], {\\\"y"}, [1, [2]], "s,t", 3]')
+        self.addCleanup(os.remove, path)
+        with open(path, "rb") as f:
+            self.assertEqual(index_items(f, 1)[0], 4)
+
+    def test_index_items_rejects_truncated_array(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b'[{"location": "x"}, {"location": "unterminated')
+        self.addCleanup(os.remove, path)
+        with open(path, "rb") as f, self.assertRaisesMessage(ValueError, "Unterminated JSON array"):
+            index_items(f, 1)
+
+    def test_chunks_cover_the_file(self):
+        job_id = str(self.job.id)
+        with open(self.path, "rb") as f:
+            total, offsets = index_items(f, 3)
+        created = [
+            ingest_chunk(job_id, self.path, offset, min(3, total - i * 3), 2)
+            for i, offset in enumerate(offsets)
+        ]
+
+        self.assertEqual(created, [3, 3, 1])
+        self.assertEqual(
+            sorted(IoTMeasurement.objects.filter(organization=self.org).values_list("value", flat=True)),
+            [float(i) for i in range(7)],
+        )
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.processed_rows, 7)
+
+    def test_chunk_failure_marks_job_failed(self):
+        fail_air_quality_ingest(None, ValueError("bad chunk"), None, str(self.job.id))
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, "failed")
+        self.assertEqual(self.job.error_message, "bad chunk")
+        self.assertIsNotNone(self.job.finished_at)
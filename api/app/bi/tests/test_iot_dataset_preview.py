@@ -122,6 +122,21 @@ class IoTDatasetPreviewTestCase(TestCase):
         self.assertIn("value", first_item)
         self.assertIn("tags", first_item)
 
+    def test_slim_list_omits_tags(self):
+        """Test that ?fields=slim skips tags"""
+        response = self.client.get("/api/bi/iot/?fields=slim")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("tags", response.data[0])
+
+    def test_single_tag_projection(self):
+        """Test that ?tag= returns just that tag's value"""
+        response = self.client.get("/api/bi/iot/?device_id=sensor-002&tag=location")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("tags", response.data[0])
+        self.assertEqual(response.data[0]["tag_value"], "room-B")
+
     def test_tags_are_json_objects(self):
         """Test that tags are properly serialized as JSON"""
         response = self.client.get("/api/bi/iot/?device_id=sensor-001")
@@ -158,7 +173,7 @@ class IoTDatasetPreviewTestCase(TestCase):
         """Test complete workflow: ingest data then preview it"""
         # Ingest new data
         ingest_response = self.client.post(
-            "/api/bi/iot/ingest/",
+            "/api/bi/iot/ingest-sync/",
             {
                 "device_id": "sensor-003",
                 "metric": "pressure",
@@ -245,3 +260,43 @@ class IoTDatasetPreviewTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # All 50 measurements should be returned
         self.assertEqual(len(response.data), 50)
+
+    def test_cursor_pagination_is_opt_in(self):
+        """page_size switches the list to cursor pages, newest first"""
+        response = self.client.get("/api/bi/iot/?page_size=2")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["device_id"] for row in response.data["results"]],
+            ["sensor-002", "sensor-001"],
+        )
+        self.assertIsNone(response.data["previous"])
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["metric"], "temperature")
+        self.assertIsNone(response.data["next"])
+
+    def test_cursor_pages_cover_rows_sharing_a_timestamp(self):
+        """Rows with the same recorded_at are neither repeated nor skipped"""
+        same_time = datetime(2025, 12, 28, 0, 0, 0, tzinfo=timezone.utc)
+        for i in range(5):
+            IoTMeasurement.objects.create(
+                organization=self.org,
+                device_id=f"batch-{i}",
+                metric="temperature",
+                recorded_at=same_time,
+                value=float(i),
+            )
+
+        seen = []
+        url = "/api/bi/iot/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(len(set(seen)), 8)
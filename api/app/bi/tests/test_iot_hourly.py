@@ -0,0 +1,53 @@
+from datetime import UTC, datetime
+
+from django.db import connection
+from django.test import TransactionTestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.accounts.models import Organization, User
+from app.bi.models import IoTHourlyAggregate
+
+
+class IoTHourlyAggregateTests(TransactionTestCase):
+    """The continuous aggregate is unmanaged, so the tests create a stand-in table."""
+
+    def setUp(self):
+        with connection.schema_editor() as editor:
+            editor.create_model(IoTHourlyAggregate)
+        self.addCleanup(self._drop_table)
+
+        self.org = Organization.objects.create(name="Hourly Org")
+        self.other_org = Organization.objects.create(name="Other Org")
+        self.user = User.objects.create_user(username="hourly", password="password", organization=self.org)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        for org, hour, metric in [
+            (self.org, 10, "pm25"),
+            (self.org, 11, "pm25"),
+            (self.org, 11, "no2"),
+            (self.other_org, 11, "pm25"),
+        ]:
+            IoTHourlyAggregate.objects.create(
+                organization=org,
+                device_id="station-1",
+                metric=metric,
+                bucket=datetime(2025, 1, 1, hour, tzinfo=UTC),
+                avg_value=1.0,
+                min_value=0.5,
+                max_value=1.5,
+                sample_count=4,
+            )
+
+    def _drop_table(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(IoTHourlyAggregate)
+
+    def test_list_is_org_scoped_and_newest_first(self):
+        resp = self.client.get("/api/bi/iot-hourly/", {"metric": "pm25"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = resp.json()
+        self.assertEqual(len(data), 2)
+        self.assertGreater(data[0]["bucket"], data[1]["bucket"])
+        self.assertEqual(data[0]["sample_count"], 4)
@@ -1,10 +1,17 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.test import override_settings
 from django.utils.timezone import now
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 
 from app.accounts.models import Organization, User
-from app.bi.models import IoTMeasurement
+from app.bi.models import IngestionJob, IoTMeasurement
+from app.bi.tasks import process_ingestion_job
 
 
 class IoTIngestionTests(APITestCase):
@@ -47,7 +54,7 @@ class IoTIngestionTests(APITestCase):
             ],
         }
 
-        resp = self.client.post("/api/bi/iot/ingest/", payload, format="json")
+        resp = self.client.post("/api/bi/iot/ingest-sync/", payload, format="json")
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         self.assertEqual(resp.data.get("created"), 2)
 
@@ -78,7 +85,7 @@ class IoTIngestionTests(APITestCase):
             ]
         }
 
-        resp = self.client.post("/api/bi/iot/ingest/", payload, format="json")
+        resp = self.client.post("/api/bi/iot/ingest-sync/", payload, format="json")
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         self.assertEqual(resp.data.get("created"), 2)
 
@@ -99,7 +106,7 @@ class IoTIngestionTests(APITestCase):
 
         upload = SimpleUploadedFile("data.csv", csv_content, content_type="text/csv")
 
-        resp = self.client.post("/api/bi/iot/ingest/", {"file": upload}, format="multipart")
+        resp = self.client.post("/api/bi/iot/ingest-sync/", {"file": upload}, format="multipart")
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         self.assertEqual(resp.data.get("created"), 2)
 
@@ -149,7 +156,7 @@ class IoTIngestionTests(APITestCase):
             "metric": "temp",
             "rows": [{"recorded_at": now().isoformat(), "value": 25.0}],
         }
-        resp = self.client.post("/api/bi/iot/ingest/", payload, format="json")
+        resp = self.client.post("/api/bi/iot/ingest-sync/", payload, format="json")
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
 
         # Switch to user2
@@ -157,3 +164,117 @@ class IoTIngestionTests(APITestCase):
         resp2 = self.client.get("/api/bi/iot/")
         self.assertEqual(resp2.status_code, status.HTTP_200_OK)
         self.assertEqual(len(resp2.json()), 0)
+
+    def test_ingest_status_is_org_scoped(self):
+        job = IngestionJob.objects.create(organization=self.org1, source_type="json", file_path="/tmp/x.json")
+
+        self._auth_as(self.user1)
+        resp = self.client.get(f"/api/bi/iot/ingest/status/{job.id}/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["status"], "pending")
+
+        self._auth_as(self.user2)
+        resp2 = self.client.get(f"/api/bi/iot/ingest/status/{job.id}/")
+        self.assertEqual(resp2.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ingest_skips_unparseable_timestamps(self):
+        self._auth_as(self.user1)
+        payload = {
+            "device_id": "dev-9",
+            "metric": "temp",
+            "rows": [
+                {"recorded_at": "2025-01-01T00:00:00Z", "value": 1.0},
+                {"recorded_at": "2025-01-01T00:00:00Z", "value": 2.0},
+                {"recorded_at": "not-a-date", "value": 3.0},
+            ],
+        }
+        resp = self.client.post("/api/bi/iot/ingest-sync/", payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.json()["created"], 2)
+        self.assertEqual(IoTMeasurement.objects.filter(organization=self.org1, device_id="dev-9").count(), 2)
+
+    def test_ingest_rejects_malformed_json_body(self):
+        self._auth_as(self.user1)
+        resp = self.client.post(
+            "/api/bi/iot/ingest-sync/", '{"device_id": ', content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("JSON parse error", resp.json()["detail"])
+
+    def test_export_streams_ndjson(self):
+        for org, value in [(self.org1, 1.0), (self.org1, 2.0), (self.org2, 3.0)]:
+            IoTMeasurement.objects.create(
+                organization=org, device_id="dev-8", metric="temp", recorded_at=now(), value=value
+            )
+
+        self._auth_as(self.user1)
+        resp = self.client.get("/api/bi/iot/export/", {"device_id": "dev-8"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        lines = b"".join(resp.streaming_content).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(sorted(r["value"] for r in rows), [1.0, 2.0])
+        self.assertIn("tags", rows[0])
+
+        resp = self.client.get("/api/bi/iot/export/", {"device_id": "dev-8", "fields": "slim"})
+        rows = [json.loads(line) for line in b"".join(resp.streaming_content).splitlines()]
+        self.assertNotIn("tags", rows[0])
+
+    def test_ingest_queues_job_after_commit(self):
+        # The task never runs here, so nothing would remove the staged upload.
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self._auth_as(self.user1)
+        payload = {"device_id": "dev-1", "metric": "temp", "rows": [{"recorded_at": now().isoformat(), "value": 1.0}]}
+        with override_settings(MEDIA_ROOT=media_root), self.captureOnCommitCallbacks(execute=False) as callbacks:
+            resp = self.client.post("/api/bi/iot/ingest/", payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(callbacks), 1)
+        job = IngestionJob.objects.get(id=resp.json()["id"])
+        self.assertEqual(job.status, "pending")
+        self.assertEqual(callbacks[0].args, (str(job.id),))
+
+    @override_settings(DASHY_BULK_BATCH_SIZE=2)
+    def test_job_failure_reports_rows_committed_before_a_syntax_error(self):
+        item = '{"location": "s1", "parameter": "pm25", "date": {"utc": "2025-01-01T00:00:00Z"}, "value": 1}'
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            f.write(f"[{item}, {item}, {item}, {{")
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        job = IngestionJob.objects.create(organization=self.org1, source_type="json", file_name="a.json", file_path=path)
+
+        process_ingestion_job(str(job.id))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIn("2 rows were committed before the error", job.error_message)
+        self.assertEqual(job.processed_rows, 2)
+        self.assertEqual(IoTMeasurement.objects.filter(organization=self.org1).count(), 2)
+
+    def test_redelivered_job_does_not_insert_rows_twice(self):
+        item = '{"location": "s1", "parameter": "pm25", "date": {"utc": "2025-01-01T00:00:00Z"}, "value": 1}'
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            f.write(f"[{item}, {item}]")
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        job = IngestionJob.objects.create(organization=self.org1, source_type="json", file_name="a.json", file_path=path)
+
+        process_ingestion_job(str(job.id))
+        result = process_ingestion_job(str(job.id))
+
+        self.assertEqual(result["skipped"], "job already claimed")
+        job.refresh_from_db()
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(IoTMeasurement.objects.filter(organization=self.org1).count(), 2)
+
+        # A worker that died mid-run leaves the job processing with its file in place.
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            f.write(f"[{item}, {item}]")
+        self.addCleanup(os.remove, path)
+        crashed = IngestionJob.objects.create(
+            organization=self.org1, source_type="json", file_name="b.json", file_path=path, status="processing"
+        )
+        process_ingestion_job(str(crashed.id))
+        self.assertEqual(IoTMeasurement.objects.filter(organization=self.org1).count(), 2)
@@ -0,0 +1,97 @@
+import json
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from app.accounts.models import Organization, User
+from app.bi.models import IoTMeasurement
+
+
+class VizQueryTests(APITestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Query Org")
+        other_org = Organization.objects.create(name="Other Org")
+        self.user = User.objects.create_user(username="analyst", password="password", organization=self.org)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        for org, device_id in [(self.org, "mine"), (other_org, "theirs")]:
+            IoTMeasurement.objects.create(
+                organization=org, device_id=device_id, metric="temp", recorded_at=now(), value=1.0
+            )
+
+    def _query(self, query, **extra):
+        return self.client.post("/api/bi/viz/query/", {"query": query, **extra}, format="json")
+
+    def _result(self, resp):
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return json.loads(b"".join(resp.streaming_content))
+
+    def test_query_is_org_scoped_in_any_case(self):
+        for table in ("bi_iotmeasurement", "BI_IOTMEASUREMENT", "Bi_IotMeasurement"):
+            with self.subTest(table=table):
+                result = self._result(self._query(f"SELECT device_id FROM {table}"))
+                self.assertEqual(result["rows"], [{"device_id": "mine"}])
+
+    def test_rejects_non_select(self):
+        resp = self._query("DELETE FROM bi_iotmeasurement")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self._query("SELECT 1; DROP TABLE bi_iotmeasurement")
+        self.assertEqual(resp.json()["error"], "Query contains forbidden keyword: DROP")
+
+    def test_schema_supports_conditional_get(self):
+        resp = self.client.get("/api/bi/viz/schema/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["table_name"], "bi_iotmeasurement")
+        self.assertIn("max-age=3600", resp["Cache-Control"])
+
+        resp2 = self.client.get("/api/bi/viz/schema/", HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp2.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.force_authenticate(user=None)
+        resp3 = self.client.get("/api/bi/viz/schema/", HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp3.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_query_with_literal_percent_and_limit(self):
+        result = self._result(
+            self._query("SELECT device_id FROM bi_iotmeasurement WHERE device_id LIKE '%in%'", limit=5)
+        )
+        self.assertEqual(result["rows"], [{"device_id": "mine"}])
+
+        result = self._result(self._query("SELECT device_id FROM bi_iotmeasurement", limit=0))
+        self.assertEqual(result, {"columns": ["device_id"], "rows": [], "count": 0})
+
+    def test_query_result_streams_all_columns(self):
+        result = self._result(
+            self._query("SELECT device_id, value, recorded_at FROM bi_iotmeasurement ORDER BY device_id")
+        )
+        self.assertEqual(result["columns"], ["device_id", "value", "recorded_at"])
+        self.assertEqual(result["count"], 1)
+        self.assertEqual(result["rows"][0]["value"], 1.0)
+
+    def test_invalid_sql_is_a_bad_request(self):
+        resp = self._query("SELECT no_such_column FROM bi_iotmeasurement")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", resp.json())
+
+    @skipUnless(connection.vendor == "postgresql", "runtime SQL errors are PostgreSQL-specific")
+    def test_runtime_error_in_first_batch_is_a_bad_request(self):
+        resp = self._query("SELECT 1 / (value - 1) AS x FROM bi_iotmeasurement")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("division by zero", resp.json()["error"])
+
+    @skipUnless(connection.vendor == "postgresql", "runtime SQL errors are PostgreSQL-specific")
+    def test_runtime_error_mid_stream_closes_the_document(self):
+        IoTMeasurement.objects.create(
+            organization=self.org, device_id="zero", metric="temp", recorded_at=now(), value=0.0
+        )
+        with mock.patch("app.bi.views.EXPORT_CHUNK_SIZE", 1):
+            result = self._result(
+                self._query("SELECT device_id, 1 / value AS x FROM bi_iotmeasurement ORDER BY device_id")
+            )
+        self.assertEqual(result["rows"], [{"device_id": "mine", "x": 1.0}])
+        self.assertEqual(result["count"], 1)
+        self.assertIn("division by zero", result["error"])
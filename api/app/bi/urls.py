@@ -6,6 +6,7 @@ from .views import (
     IndicatorViewSet,
     WorkspaceViewSet,
     IoTMeasurementViewSet,
+    IoTHourlyAggregateViewSet,
     IngestionJobViewSet,
     execute_sql_query,
     get_table_schema,
@@ -17,6 +18,7 @@ router.register("workspaces", WorkspaceViewSet)
 router.register("dashboards", DashboardViewSet)
 router.register("indicators", IndicatorViewSet)
 router.register("iot", IoTMeasurementViewSet)
+router.register("iot-hourly", IoTHourlyAggregateViewSet)
 router.register("ingestion-jobs", IngestionJobViewSet)
 
 urlpatterns = [
@@ -1,27 +1,217 @@
 import csv
+import hashlib
 import io
 import os
-import tempfile
+import re
+import shutil
 import uuid
+from functools import partial
+from itertools import islice
+from operator import itemgetter
 
+import ijson
+import orjson
 from django.conf import settings
-from django.db import connection
+from django.core.files.move import file_move_safe
+from django.db import connection, transaction
+from django.db.models.fields.json import KT
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import etag
 from rest_framework import status
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
-from .models import Dashboard, Indicator, IngestionJob, IoTMeasurement, Workspace
+from .models import Dashboard, Indicator, IngestionJob, IoTHourlyAggregate, IoTMeasurement, Workspace
+from .pagination import MeasurementCursorPagination
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer, encode_json
 from .serializers import (
     DashboardSerializer,
     IndicatorSerializer,
+    IngestionJobListSerializer,
     IngestionJobSerializer,
+    IoTHourlyAggregateSerializer,
+    IoTMeasurementListSerializer,
     IoTMeasurementSerializer,
+    IoTMeasurementTagSerializer,
     WorkspaceSerializer,
 )
-from .tasks import process_ingestion_job
+from .services.bulk import bulk_load_transaction, insert_measurements
+from .services.parsing import ijson_backend, parse_timestamp, peek_json_kind
+from .tasks import NDJSON_EXTENSIONS, process_ingestion_job
+
+# Item keys copied into tags for OpenAQ-style items, in this order.
+_TAG_KEYS = ("city", "country", "unit", "location", "coordinates")
+
+_loads = orjson.loads
+
+# Actions that return many measurement rows and can use the slim list serializers.
+_LIST_ACTIONS = ("list", "export")
+
+# Rows fetched per round trip when streaming an export or a query result.
+EXPORT_CHUNK_SIZE = 2000
+
+# Block size for writing in-memory uploads to the staging directory.
+STAGE_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+# The IoT table as it may appear in a user query, in any letter case.
+_IOT_TABLE_RE = re.compile("bi_iotmeasurement", re.IGNORECASE)
+
+
+def _safe_json(raw):
+    """Decode a CSV ``tags`` cell; empty or invalid JSON becomes ``{}``."""
+    if not raw:
+        return {}
+    try:
+        return _loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+
+
+def _stage_upload(file, path):
+    """
+    Put an uploaded file at ``path`` for the ingestion worker.
+
+    Uploads over FILE_UPLOAD_MAX_MEMORY_SIZE are already spooled to disk by
+    Django, so they are moved (a rename on the same filesystem) rather than
+    copied; in-memory uploads are written out in large blocks.
+    """
+    if hasattr(file, "temporary_file_path"):
+        file_move_safe(file.temporary_file_path(), path)
+        return
+    file.seek(0)
+    with open(path, "wb") as dest:
+        shutil.copyfileobj(file, dest, STAGE_COPY_BUFFER_SIZE)
+
+
+def _csv_columns(header):
+    """
+    Resolve an ingest-sync CSV header once, so rows are read by position
+    instead of through a dict per row. Returns ``(required, value_idx,
+    tags_idx)``, where ``required`` picks device_id, metric and recorded_at
+    from a row, or None when one of those columns is missing.
+    """
+    positions = {name: i for i, name in enumerate(header)}
+    try:
+        required = itemgetter(positions["device_id"], positions["metric"], positions["recorded_at"])
+    except KeyError:
+        return None
+    return required, positions.get("value"), positions.get("tags")
+
+
+def _csv_rows(reader):
+    """
+    Yield measurement rows from an ingest-sync CSV reader, skipping rows
+    missing a required field or with an unparseable recorded_at.
+    """
+    header = next(reader, None) or []
+    columns = _csv_columns(header)
+    if columns is None:
+        return  # Every row would lack a required field.
+    required, value_idx, tags_idx = columns
+    width = len(header)
+    padding = [""] * width
+    safe_json = _safe_json
+    last_raw = last_ts = None
+    for row in reader:
+        if len(row) < width:
+            row += padding[len(row):]
+        device_id, metric, recorded_at = required(row)
+        device_id = device_id.strip()
+        metric = metric.strip()
+        
+        if not device_id or not metric or not recorded_at:
+            continue  # Skip rows with missing required fields
+        if recorded_at != last_raw:
+            last_raw, last_ts = recorded_at, parse_timestamp(recorded_at)
+        if last_ts is None:
+            continue  # ...and rows whose timestamp does not parse
+        
+        value = row[value_idx] if value_idx is not None else ""
+        yield (
+            device_id,
+            metric,
+            last_ts,
+            float(value) if value else None,
+            safe_json(row[tags_idx]) if tags_idx is not None else {},
+        )
+
+
+def _insert_rows(org_id, rows):
+    """
+    Insert measurement rows batch by batch as they are built, so at most one
+    batch of tuples is held at a time. COPY on PostgreSQL, bulk_create
+    elsewhere. Returns the number of rows created.
+    """
+    batch_size = settings.DASHY_BULK_BATCH_SIZE
+    created = 0
+    while batch := list(islice(rows, batch_size)):
+        created += insert_measurements(org_id, batch, batch_size)
+    return created
+
+
+def _openaq_rows(items):
+    """
+    Yield measurement rows for OpenAQ-style items, skipping incomplete ones
+    and those whose date does not parse.
+    """
+    # Consecutive items usually share a timestamp, so remember the last one.
+    last_raw = last_ts = None
+    for item in items:
+        get = item.get
+        device_id = get("location", "").strip()
+        metric = get("parameter", "").strip()
+        
+        # Handle date - can be nested or direct
+        date_obj = get("date", {})
+        recorded_at = (date_obj.get("utc") or date_obj.get("local")) if isinstance(date_obj, dict) else date_obj
+        
+        if not device_id or not metric or not recorded_at:
+            continue
+        if recorded_at != last_raw:
+            last_raw, last_ts = recorded_at, parse_timestamp(recorded_at)
+        if last_ts is None:
+            continue
+        
+        tags = {key: value for key in _TAG_KEYS if (value := get(key)) is not None}
+        yield device_id, metric, last_ts, get("value"), tags
+
+
+def _standard_rows(data):
+    """
+    Yield measurement rows for the standard ``{device_id, metric, rows}``
+    payload. Per-row device_id/metric override the payload-level ones; rows
+    missing a field or with an unparseable recorded_at are skipped.
+    """
+    device_id = data.get("device_id", "").strip() if isinstance(data.get("device_id"), str) else ""
+    metric = data.get("metric", "").strip() if isinstance(data.get("metric"), str) else ""
+    last_raw = last_ts = None
+    
+    for r in data.get("rows", []):
+        get = r.get
+        # The payload-level defaults are already stripped; only per-row
+        # overrides need it.
+        row_device = get("device_id")
+        row_device = row_device.strip() if row_device else device_id
+        row_metric = get("metric")
+        row_metric = row_metric.strip() if row_metric else metric
+        row_recorded_at = get("recorded_at")
+        
+        if not row_device or not row_metric or not row_recorded_at:
+            continue
+        if row_recorded_at != last_raw:
+            last_raw, last_ts = row_recorded_at, parse_timestamp(row_recorded_at)
+        if last_ts is None:
+            continue
+        
+        yield row_device, row_metric, last_ts, get("value"), get("tags", {})
+
 
 class WorkspaceViewSet(ModelViewSet):
     queryset = Workspace.objects.all()
@@ -29,7 +219,7 @@ class WorkspaceViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Workspace.objects.filter(organization=self.request.user.organization)
+        return Workspace.objects.filter(organization_id=self.request.user.organization_id)
 
 
 class DashboardViewSet(ModelViewSet):
@@ -38,7 +228,7 @@ class DashboardViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Dashboard.objects.filter(workspace__organization=self.request.user.organization)
+        return Dashboard.objects.filter(workspace__organization_id=self.request.user.organization_id)
 
 
 class IndicatorViewSet(ModelViewSet):
@@ -48,7 +238,7 @@ class IndicatorViewSet(ModelViewSet):
 
     def get_queryset(self):
         return Indicator.objects.filter(
-            category__organization=self.request.user.organization
+            category__organization_id=self.request.user.organization_id
         )
 
 
@@ -56,11 +246,13 @@ class IoTMeasurementViewSet(ModelViewSet):
     queryset = IoTMeasurement.objects.all()
     serializer_class = IoTMeasurementSerializer
     permission_classes = [IsAuthenticated]
-    parser_classes = [JSONParser, MultiPartParser]
+    parser_classes = [ORJSONParser, MultiPartParser]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = MeasurementCursorPagination
 
     def get_queryset(self):
         qs = IoTMeasurement.objects.filter(
-            organization=self.request.user.organization
+            organization_id=self.request.user.organization_id
         )
         device_id = self.request.query_params.get("device_id")
         metric = self.request.query_params.get("metric")
@@ -68,15 +260,71 @@ class IoTMeasurementViewSet(ModelViewSet):
             qs = qs.filter(device_id=device_id)
         if metric:
             qs = qs.filter(metric=metric)
-        return qs.order_by("-recorded_at")
+        if self._is_slim_list():
+            # Skip shipping and decoding the tags JSON for every row; ?tag=<key>
+            # pulls just that one key out server-side (tags->>'<key>').
+            qs = qs.defer("tags")
+            tag = self.request.query_params.get("tag")
+            if tag:
+                qs = qs.annotate(tag_value=KT(f"tags__{tag}"))
+        return qs.order_by("-recorded_at", "-id")
+
+    def list(self, request, *args, **kwargs):
+        """
+        Unpaginated lists skip the serializer: rows come straight from
+        values() and ORJSONRenderer encodes them to the same JSON the
+        serializer would produce, without a field pass per row.
+        """
+        serializer_class = self.get_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = serializer_class(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        fields = list(serializer_class().fields)
+        return Response(list(queryset.values(*fields)))
+
+    def get_serializer_class(self):
+        if not self._is_slim_list():
+            return IoTMeasurementSerializer
+        if self.request.query_params.get("tag"):
+            return IoTMeasurementTagSerializer
+        return IoTMeasurementListSerializer
+
+    def _is_slim_list(self):
+        """Lists leave out tags only when asked to (?fields=slim or ?tag=<key>)."""
+        params = self.request.query_params
+        return self.action in _LIST_ACTIONS and (
+            params.get("fields") == "slim" or bool(params.get("tag"))
+        )
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Stream the filtered measurements as NDJSON, one object per line.
+
+        Accepts the same filters as the list. Rows are read through a
+        server-side cursor in chunks and encoded as they go, so memory stays
+        flat and the first bytes go out before the whole result is read.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        to_representation = self.get_serializer().to_representation
+        dumps = orjson.dumps
+
+        def lines():
+            for obj in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                yield dumps(to_representation(obj)) + b"\n"
+
+        return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
 
     @action(detail=False, methods=["post"], url_path="ingest")
     def ingest(self, request):
         """
         Async ingestion endpoint - creates an IngestionJob and processes in background.
         
-        Accepts file upload (JSON or CSV) and returns immediately with job ID.
-        Poll the job status via /api/bi/ingestion-jobs/{id}/ to track progress.
+        Accepts a file upload (JSON or CSV) or a JSON body and returns
+        immediately with the job. Poll /api/bi/iot/ingest/status/{id}/ (or
+        /api/bi/ingestion-jobs/{id}/ for the full logs) to track progress.
         
         CSV upload expects columns: device_id, metric, recorded_at, value, tags(optional JSON)
         Flexible column mapping supports common variations like: location, parameter, timestamp, etc.
@@ -84,42 +332,54 @@ class IoTMeasurementViewSet(ModelViewSet):
         JSON formats supported:
         1. Array of objects (OpenAQ-style)
         2. Object with rows array
+        3. Newline-delimited JSON (.ndjson/.jsonl), one OpenAQ-style object per line
         """
-        org = request.user.organization
-        if not org:
+        org_id = request.user.organization_id
+        if not org_id:
             return Response(
                 {"error": "User must be associated with an organization"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if "file" not in request.FILES:
+        body = None
+        if "file" in request.FILES:
+            file = request.FILES["file"]
+            file_name = file.name
+            
+            # Determine source type
+            is_json = (
+                file_name.lower().endswith(('.json',) + NDJSON_EXTENSIONS)
+                or file.content_type in ('application/json', 'application/x-ndjson')
+            )
+        elif request.content_type.startswith("application/json") and request.data:
+            # Stage the body as a JSON file so the worker handles it like an upload.
+            file_name = "request-body.json"
+            body = orjson.dumps(request.data)
+            is_json = True
+        else:
             return Response(
-                {"error": "No file provided. Use multipart/form-data with 'file' field."},
+                {"error": "No data provided. Upload a 'file' with multipart/form-data or send a JSON body."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        file = request.FILES["file"]
-        file_name = file.name
-        
-        # Determine source type
-        is_json = file_name.lower().endswith('.json') or file.content_type == 'application/json'
         source_type = "json" if is_json else "csv"
         
         # Save file to temp location
-        upload_dir = os.path.join(settings.MEDIA_ROOT, "uploads", str(org.id))
+        upload_dir = os.path.join(settings.MEDIA_ROOT, "uploads", str(org_id))
         os.makedirs(upload_dir, exist_ok=True)
         
         file_id = str(uuid.uuid4())
         file_extension = ".json" if is_json else ".csv"
         temp_path = os.path.join(upload_dir, f"{file_id}{file_extension}")
         
-        with open(temp_path, "wb") as dest:
-            for chunk in file.chunks():
-                dest.write(chunk)
+        if body is not None:
+            with open(temp_path, "wb") as dest:
+                dest.write(body)
+        else:
+            _stage_upload(file, temp_path)
         
         # Create ingestion job
         job = IngestionJob.objects.create(
-            organization=org,
+            organization_id=org_id,
             created_by=request.user,
             source_type=source_type,
             file_name=file_name,
@@ -127,12 +387,23 @@ class IoTMeasurementViewSet(ModelViewSet):
             status="pending",
         )
         
-        # Queue the task
-        process_ingestion_job.delay(str(job.id))
+        # Queue the task once the job row is committed, so the worker never
+        # looks it up before it exists.
+        transaction.on_commit(partial(process_ingestion_job.delay, str(job.id)))
         
         serializer = IngestionJobSerializer(job)
         return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
+    @action(detail=False, methods=["get"], url_path=r"ingest/status/(?P<job_id>[^/.]+)")
+    def ingest_status(self, request, job_id=None):
+        """Status and progress of a job queued by ``ingest``, without its logs."""
+        job = get_object_or_404(
+            IngestionJob.objects.defer("logs"),
+            id=job_id,
+            organization_id=request.user.organization_id,
+        )
+        return Response(IngestionJobListSerializer(job).data)
+
     @action(detail=False, methods=["post"], url_path="ingest-sync")
     def ingest_sync(self, request):
         """
@@ -140,9 +411,13 @@ class IoTMeasurementViewSet(ModelViewSet):
         
         Accepts either JSON body or file upload.
         Use /ingest/ for large files - they will be processed in background.
+
+        Rows are inserted DASHY_BULK_BATCH_SIZE at a time (default 10000).
+        Larger batches mean fewer round trips but more rows held in memory
+        per request; lower the setting if web workers run short of memory.
         """
-        org = request.user.organization
-        if not org:
+        org_id = request.user.organization_id
+        if not org_id:
             return Response(
                 {"error": "User must be associated with an organization"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -150,133 +425,80 @@ class IoTMeasurementViewSet(ModelViewSet):
         
         created = 0
 
-        if "file" in request.FILES:
-            file = request.FILES["file"]
-            content = file.read().decode("utf-8")
-            
-            # Check if it's JSON or CSV
-            if file.name.endswith('.json') or file.content_type == 'application/json':
-                try:
-                    import json
-                    data = json.loads(content)
-                    created = self._ingest_json_data(data, org)
-                except json.JSONDecodeError:
-                    return Response(
-                        {"error": "Invalid JSON file"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            else:
-                # CSV processing
-                reader = csv.DictReader(io.StringIO(content))
-                rows = []
-                for row in reader:
-                    device_id = row.get("device_id", "").strip()
-                    metric = row.get("metric", "").strip()
-                    recorded_at = row.get("recorded_at")
-                    
-                    if not device_id or not metric or not recorded_at:
-                        continue  # Skip rows with missing required fields
-                    
-                    rows.append(
-                        IoTMeasurement(
-                            organization=org,
-                            device_id=device_id,
-                            metric=metric,
-                            recorded_at=recorded_at,
-                            value=float(row.get("value")) if row.get("value") not in (None, "") else None,
-                            tags=self._safe_json(row.get("tags")),
-                        )
-                    )
-                if rows:
-                    IoTMeasurement.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
-                    created = len(rows)
-        else:
-            created = self._ingest_json_data(request.data, org)
+        try:
+            # One transaction for the whole upload: it commits (and, on
+            # PostgreSQL, skips the WAL flush wait) once, and a bad file
+            # leaves no partial rows behind.
+            with bulk_load_transaction():
+                if "file" in request.FILES:
+                    created = self._ingest_file(request.FILES["file"], org_id)
+                else:
+                    created = self._ingest_json_data(request.data, org_id)
+        except (orjson.JSONDecodeError, ijson.JSONError):
+            return Response(
+                {"error": "Invalid JSON file"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         return Response({"created": created}, status=status.HTTP_201_CREATED)
 
-        return Response({"created": created}, status=status.HTTP_201_CREATED)
+    def _ingest_file(self, file, org_id):
+        """
+        Ingest an uploaded JSON or CSV file. Returns the number of records created.
+        Invalid JSON raises orjson.JSONDecodeError or ijson.JSONError.
+        """
+        # Check if it's JSON or CSV
+        if file.name.endswith('.json') or file.content_type == 'application/json':
+            if peek_json_kind(file) == "array":
+                # Stream the items instead of holding the parsed document too.
+                data = ijson_backend.items(file, "item", use_float=True)
+            else:
+                # orjson parses the raw bytes; no decoded str copy of the upload.
+                data = orjson.loads(file.read())
+            return self._ingest_json_data(data, org_id)
+
+        # CSV processing: decode and parse while reading, flushing
+        # every batch_size rows so memory stays bounded.
+        text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+        try:
+            return _insert_rows(org_id, _csv_rows(csv.reader(text)))
+        finally:
+            text.detach()
 
-    def _ingest_json_data(self, data, org):
+    def _ingest_json_data(self, data, org_id):
         """
         Handle JSON data ingestion supporting multiple formats.
         Returns the number of records created.
         """
-        objs = []
-        
-        # Check if it's an array (OpenAQ format) or object with rows
-        if isinstance(data, list):
-            # OpenAQ-style array format
-            for item in data:
-                # Map OpenAQ fields to our schema
-                device_id = item.get("location", "").strip()
-                metric = item.get("parameter", "").strip()
-                
-                # Handle date - can be nested or direct
-                date_obj = item.get("date", {})
-                if isinstance(date_obj, dict):
-                    recorded_at = date_obj.get("utc") or date_obj.get("local")
-                else:
-                    recorded_at = date_obj
-                
-                if not device_id or not metric or not recorded_at:
-                    continue
-                
-                # Build tags from available metadata
-                tags = {}
-                for key in ["city", "country", "unit", "location", "coordinates"]:
-                    if key in item and item[key] is not None:
-                        tags[key] = item[key]
-                
-                objs.append(
-                    IoTMeasurement(
-                        organization=org,
-                        device_id=device_id,
-                        metric=metric,
-                        recorded_at=recorded_at,
-                        value=item.get("value"),
-                        tags=tags,
-                    )
-                )
+        # Check if it's an object with rows or an array (OpenAQ format);
+        # arrays may also be a stream of items from an uploaded file.
+        if isinstance(data, dict):
+            rows = _standard_rows(data)
         else:
-            # Standard format with device_id, metric, rows
-            device_id = data.get("device_id", "").strip() if isinstance(data.get("device_id"), str) else ""
-            metric = data.get("metric", "").strip() if isinstance(data.get("metric"), str) else ""
-            rows = data.get("rows", [])
-            
-            for r in rows:
-                row_device = (r.get("device_id") or device_id or "").strip()
-                row_metric = (r.get("metric") or metric or "").strip()
-                row_recorded_at = r.get("recorded_at")
-                
-                if not row_device or not row_metric or not row_recorded_at:
-                    continue
-                
-                objs.append(
-                    IoTMeasurement(
-                        organization=org,
-                        device_id=row_device,
-                        metric=row_metric,
-                        recorded_at=row_recorded_at,
-                        value=r.get("value"),
-                        tags=r.get("tags", {}),
-                    )
-                )
-        
-        if objs:
-            IoTMeasurement.objects.bulk_create(objs, batch_size=1000, ignore_conflicts=True)
-        
-        return len(objs)
+            rows = _openaq_rows(data)
+        return _insert_rows(org_id, rows)
 
-    def _safe_json(self, raw):
-        if not raw:
-            return {}
-        try:
-            import json
 
-            return json.loads(raw)
-        except Exception:
-            return {}
+class IoTHourlyAggregateViewSet(ReadOnlyModelViewSet):
+    """
+    Hourly avg/min/max/count per device and metric, served from the
+    bi_iot_hourly continuous aggregate instead of scanning raw measurements.
+    """
+    queryset = IoTHourlyAggregate.objects.all()
+    serializer_class = IoTHourlyAggregateSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        qs = IoTHourlyAggregate.objects.filter(
+            organization_id=self.request.user.organization_id
+        )
+        device_id = self.request.query_params.get("device_id")
+        metric = self.request.query_params.get("metric")
+        if device_id:
+            qs = qs.filter(device_id=device_id)
+        if metric:
+            qs = qs.filter(metric=metric)
+        return qs.order_by("-bucket")
 
 
 class IngestionJobViewSet(ModelViewSet):
@@ -290,9 +512,17 @@ class IngestionJobViewSet(ModelViewSet):
     http_method_names = ["get", "head", "options"]  # Read-only
 
     def get_queryset(self):
-        return IngestionJob.objects.filter(
-            organization=self.request.user.organization
+        qs = IngestionJob.objects.filter(
+            organization_id=self.request.user.organization_id
         ).order_by("-created_at")
+        if self.action == "list":
+            qs = qs.defer("logs")
+        return qs
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return IngestionJobListSerializer
+        return IngestionJobSerializer
 
 
 @api_view(["POST"])
@@ -308,8 +538,8 @@ def execute_sql_query(request):
         "limit": 1000
     }
     """
-    org = request.user.organization
-    if not org:
+    org_id = request.user.organization_id
+    if not org_id:
         return Response(
             {"error": "User must be associated with an organization"},
             status=status.HTTP_400_BAD_REQUEST
@@ -345,100 +575,131 @@ def execute_sql_query(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
-    # Inject organization filter for security
-    # Wrap user query as subquery and filter by organization
-    org_id = org.id
-    
-    # Check if query already references bi_iotmeasurement
-    if "BI_IOTMEASUREMENT" in query_upper:
-        # Add WHERE clause for organization filtering
-        # This is a simplified approach - for production, use a proper SQL parser
-        safe_query = f"""
+    # Inject organization filter for security: every reference to the IoT
+    # table is rewritten to a CTE holding only this organization's rows.
+    # The match ignores case, since SQL identifiers do too; a mixed-case
+    # spelling must not reach the raw table.
+    # org_id and the limit are bound as parameters, so the statement text
+    # depends only on the user's query. A literal % in that query has to be
+    # doubled once parameters are passed.
+    query = query.replace("%", "%%")
+    if _IOT_TABLE_RE.search(query):
+        sql = f"""
+        WITH org_data AS (
+            SELECT * FROM bi_iotmeasurement WHERE organization_id = %s
+        )
         SELECT * FROM (
-            {query}
-        ) AS user_query
-        LIMIT {limit}
+            {_IOT_TABLE_RE.sub("org_data", query)}
+        ) AS filtered_result
+        LIMIT %s
         """
-        # We'll rely on the fact that users can only see their org's data
-        # by checking if the query touches the IoT table
+        params = [org_id, limit]
     else:
-        safe_query = f"{query} LIMIT {limit}"
+        sql = f"{query} LIMIT %s"
+        params = [limit]
     
+    # A chunked cursor is server-side on PostgreSQL: rows are fetched and
+    # encoded a batch at a time while the response streams out. Runtime
+    # errors (division by zero, bad casts) only surface when rows are
+    # fetched, so the first batch is read here, while a 400 can still be sent.
+    cursor = connection.chunked_cursor()
     try:
-        with connection.cursor() as cursor:
-            # For queries on bi_iotmeasurement, add org filter
-            if "BI_IOTMEASUREMENT" in query_upper or "bi_iotmeasurement" in query:
-                # Parse and inject organization filter
-                # Simple approach: wrap in CTE with org filter
-                filtered_query = f"""
-                WITH org_data AS (
-                    SELECT * FROM bi_iotmeasurement WHERE organization_id = {org_id}
-                )
-                SELECT * FROM (
-                    {query.replace('bi_iotmeasurement', 'org_data').replace('BI_IOTMEASUREMENT', 'org_data')}
-                ) AS filtered_result
-                LIMIT {limit}
-                """
-                cursor.execute(filtered_query)
-            else:
-                cursor.execute(safe_query)
-            
-            columns = [col[0] for col in cursor.description] if cursor.description else []
-            rows = cursor.fetchall()
-            
-            # Convert to list of dicts
-            results = [dict(zip(columns, row)) for row in rows]
-            
-            return Response({
-                "columns": columns,
-                "rows": results,
-                "count": len(results)
-            })
+        cursor.execute(sql, params)
+        rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
     except Exception as e:
+        cursor.close()
         return Response(
             {"error": str(e)},
             status=status.HTTP_400_BAD_REQUEST
         )
+    
+    columns = [col[0] for col in cursor.description] if cursor.description else []
+    return StreamingHttpResponse(
+        _stream_query_result(cursor, columns, rows), content_type="application/json"
+    )
+
+
+def _stream_query_result(cursor, columns, rows):
+    """
+    Encode ``{"columns": [...], "rows": [...], "count": n}`` from an executed
+    cursor, starting with the already fetched ``rows`` and then one
+    fetchmany() batch per chunk, then close the cursor.
+
+    The status line has gone out by the time later batches are fetched, so a
+    failure there closes the document with the rows sent so far and an
+    ``"error"`` key instead of truncating the JSON.
+    """
+    # Leave datetimes to DRF's encoder so timestamps keep the format the
+    # endpoint has always returned.
+    option = orjson.OPT_PASSTHROUGH_DATETIME
+    count = 0
+    try:
+        yield b'{"columns":' + encode_json(columns) + b',"rows":['
+        separator = b""
+        try:
+            while rows:
+                yield separator + b",".join(
+                    encode_json(dict(zip(columns, row, strict=True)), option) for row in rows
+                )
+                separator = b","
+                count += len(rows)
+                rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+        except Exception as e:
+            yield b'],"count":' + str(count).encode() + b',"error":' + encode_json(str(e)) + b"}"
+            return
+        yield b'],"count":' + str(count).encode() + b"}"
+    finally:
+        cursor.close()
+
+
+# Static description of the IoT table for the SQL helper. It never changes
+# at runtime, so it is encoded once and served with an ETag.
+IOT_TABLE_SCHEMA = {
+    "table_name": "bi_iotmeasurement",
+    "columns": [
+        {"name": "id", "type": "UUID", "description": "Unique identifier"},
+        {"name": "organization_id", "type": "INTEGER", "description": "Organization foreign key"},
+        {"name": "device_id", "type": "VARCHAR(255)", "description": "Device identifier"},
+        {"name": "metric", "type": "VARCHAR(255)", "description": "Metric name (e.g., temperature, pm25)"},
+        {"name": "recorded_at", "type": "TIMESTAMP", "description": "Timestamp of the measurement"},
+        {"name": "value", "type": "FLOAT", "description": "Numeric value of the measurement"},
+        {"name": "tags", "type": "JSONB", "description": "Additional metadata as JSON"},
+    ],
+    "example_queries": [
+        {
+            "description": "Get average value by device",
+            "query": "SELECT device_id, AVG(value) as avg_value FROM bi_iotmeasurement GROUP BY device_id"
+        },
+        {
+            "description": "Get hourly aggregates",
+            "query": "SELECT date_trunc('hour', recorded_at) as hour, device_id, AVG(value) as avg_value FROM bi_iotmeasurement GROUP BY hour, device_id ORDER BY hour"
+        },
+        {
+            "description": "Get latest values per device",
+            "query": "SELECT DISTINCT ON (device_id) device_id, metric, value, recorded_at FROM bi_iotmeasurement ORDER BY device_id, recorded_at DESC"
+        },
+        {
+            "description": "Filter by metric type",
+            "query": "SELECT * FROM bi_iotmeasurement WHERE metric = 'pm25' ORDER BY recorded_at DESC LIMIT 100"
+        },
+        {
+            "description": "Time range query",
+            "query": "SELECT * FROM bi_iotmeasurement WHERE recorded_at >= NOW() - INTERVAL '7 days'"
+        }
+    ]
+}
+_IOT_TABLE_SCHEMA_JSON = orjson.dumps(IOT_TABLE_SCHEMA)
+_IOT_TABLE_SCHEMA_ETAG = hashlib.md5(_IOT_TABLE_SCHEMA_JSON, usedforsecurity=False).hexdigest()
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@etag(lambda request: _IOT_TABLE_SCHEMA_ETAG)
 def get_table_schema(request):
     """
     Get the schema of the IoT measurement table for SQL assistance.
+    Clients that send the ETag back in If-None-Match get a 304.
     """
-    schema = {
-        "table_name": "bi_iotmeasurement",
-        "columns": [
-            {"name": "id", "type": "UUID", "description": "Unique identifier"},
-            {"name": "organization_id", "type": "INTEGER", "description": "Organization foreign key"},
-            {"name": "device_id", "type": "VARCHAR(255)", "description": "Device identifier"},
-            {"name": "metric", "type": "VARCHAR(255)", "description": "Metric name (e.g., temperature, pm25)"},
-            {"name": "recorded_at", "type": "TIMESTAMP", "description": "Timestamp of the measurement"},
-            {"name": "value", "type": "FLOAT", "description": "Numeric value of the measurement"},
-            {"name": "tags", "type": "JSONB", "description": "Additional metadata as JSON"},
-        ],
-        "example_queries": [
-            {
-                "description": "Get average value by device",
-                "query": "SELECT device_id, AVG(value) as avg_value FROM bi_iotmeasurement GROUP BY device_id"
-            },
-            {
-                "description": "Get hourly aggregates",
-                "query": "SELECT date_trunc('hour', recorded_at) as hour, device_id, AVG(value) as avg_value FROM bi_iotmeasurement GROUP BY hour, device_id ORDER BY hour"
-            },
-            {
-                "description": "Get latest values per device",
-                "query": "SELECT DISTINCT ON (device_id) device_id, metric, value, recorded_at FROM bi_iotmeasurement ORDER BY device_id, recorded_at DESC"
-            },
-            {
-                "description": "Filter by metric type",
-                "query": "SELECT * FROM bi_iotmeasurement WHERE metric = 'pm25' ORDER BY recorded_at DESC LIMIT 100"
-            },
-            {
-                "description": "Time range query",
-                "query": "SELECT * FROM bi_iotmeasurement WHERE recorded_at >= NOW() - INTERVAL '7 days'"
-            }
-        ]
-    }
-    return Response(schema)
\ No newline at end of file
+    response = HttpResponse(_IOT_TABLE_SCHEMA_JSON, content_type="application/json")
+    patch_cache_control(response, private=True, max_age=3600)
+    return response
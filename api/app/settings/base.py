@@ -148,6 +148,31 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes max per task
+# Ingestion jobs are long-running: each worker process reserves one task at a
+# time and acknowledges it when done, so a slow job never holds queued work
+# hostage while other workers sit idle. Run workers with -Ofair as well.
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_ACKS_LATE = True
+# Ingestion tasks go to their own queue so they can be given dedicated workers
+# (celery -A app worker -Q ingest) on larger hosts; a single worker pool must
+# consume both queues (-Q celery,ingest).
+CELERY_TASK_ROUTES = {"app.bi.tasks.*": {"queue": "ingest"}}
+
+# Rows per bulk insert batch. Larger batches mean fewer round trips but more
+# memory per batch; tune per host with the DASHY_BULK_BATCH_SIZE env var.
+DASHY_BULK_BATCH_SIZE = int(os.getenv("DASHY_BULK_BATCH_SIZE", "10000"))
+
+# Items per Celery task when a large JSON file is loaded by parallel workers.
+DASHY_INGEST_CHUNK_ROWS = int(os.getenv("DASHY_INGEST_CHUNK_ROWS", "100000"))
+
+# Parse CSV uploads of at least DASHY_CSV_PARALLEL_MIN_BYTES in this many
+# processes (0 or 1 keeps the single-process parser). Off by default: files
+# are split on raw newlines, so quoted fields must not contain line breaks.
+DASHY_CSV_PARSE_PROCESSES = int(os.getenv("DASHY_CSV_PARSE_PROCESSES", "0"))
+DASHY_CSV_PARALLEL_MIN_BYTES = int(os.getenv("DASHY_CSV_PARALLEL_MIN_BYTES", str(50 * 1024 * 1024)))
+
+# TimescaleDB: compress bi_iotmeasurement chunks once they are this many days old.
+TIMESCALEDB_COMPRESSION_POLICY_DAYS = int(os.getenv("TIMESCALEDB_COMPRESSION_POLICY_DAYS", "7"))
 
 # File upload settings for ingestion
 FILE_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB